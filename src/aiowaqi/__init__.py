@@ -1,35 +1,104 @@
 """Asynchronous Python client for the WAQI API."""
 
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
 from .exceptions import (
     WAQIAuthenticationError,
+    WAQICircuitOpenError,
     WAQIConnectionError,
     WAQIError,
+    WAQISerializationError,
     WAQIUnknownCityError,
     WAQIUnknownStationError,
 )
-from .models import (
-    Attribution,
-    City,
-    Coordinates,
-    Location,
-    WAQIAirQuality,
-    WAQIExtendedAirQuality,
-    WAQISearchResult,
-)
-from .waqi import WAQIClient
+
+if TYPE_CHECKING:
+    from .aggregation import AirQualityStatistics, BoundingBox, RegionAggregator
+    from .circuit_breaker import CircuitBreaker, CircuitState
+    from .conversion import AirQualityScale, ConvertedAirQuality
+    from .geo_cache import GeoCache
+    from .models import (
+        Attribution,
+        City,
+        Coordinates,
+        DailyForecast,
+        DailyForecasts,
+        Location,
+        WAQIAirQuality,
+        WAQIExtendedAirQuality,
+        WAQISearchResult,
+    )
+    from .pipeline import Pipeline
+    from .search import SearchIndex
+    from .waqi import WAQIClient
+
+_LAZY_IMPORTS = {
+    "AirQualityScale": ".conversion",
+    "AirQualityStatistics": ".aggregation",
+    "Attribution": ".models",
+    "BoundingBox": ".aggregation",
+    "CircuitBreaker": ".circuit_breaker",
+    "CircuitState": ".circuit_breaker",
+    "City": ".models",
+    "ConvertedAirQuality": ".conversion",
+    "Coordinates": ".models",
+    "DailyForecast": ".models",
+    "DailyForecasts": ".models",
+    "GeoCache": ".geo_cache",
+    "Location": ".models",
+    "Pipeline": ".pipeline",
+    "RegionAggregator": ".aggregation",
+    "SearchIndex": ".search",
+    "WAQIAirQuality": ".models",
+    "WAQIClient": ".waqi",
+    "WAQIExtendedAirQuality": ".models",
+    "WAQISearchResult": ".models",
+}
 
 __all__ = [
+    "AirQualityScale",
+    "AirQualityStatistics",
     "Attribution",
+    "BoundingBox",
+    "CircuitBreaker",
+    "CircuitState",
     "City",
+    "ConvertedAirQuality",
     "Coordinates",
+    "DailyForecast",
+    "DailyForecasts",
+    "GeoCache",
     "Location",
+    "Pipeline",
+    "RegionAggregator",
+    "SearchIndex",
     "WAQIAirQuality",
     "WAQIAuthenticationError",
+    "WAQICircuitOpenError",
     "WAQIClient",
     "WAQIConnectionError",
     "WAQIError",
     "WAQIExtendedAirQuality",
     "WAQISearchResult",
+    "WAQISerializationError",
     "WAQIUnknownCityError",
     "WAQIUnknownStationError",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import public names on first access."""
+    if (module := _LAZY_IMPORTS.get(name)) is None:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """Return the public names of the package."""
+    return sorted({*globals(), *__all__})
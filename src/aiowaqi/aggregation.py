@@ -0,0 +1,174 @@
+"""Asynchronous Python client for the WAQI API."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable, Iterable, Mapping
+
+    from .models import Coordinates, Pollutant, WAQIAirQuality
+
+type GroupBy = Callable[[WAQIAirQuality], Hashable | None]
+
+
+@dataclass(slots=True)
+class BoundingBox:
+    """Represents a bounding box of coordinates."""
+
+    south: float
+    west: float
+    north: float
+    east: float
+
+    def contains(self, coordinates: Coordinates) -> bool:
+        """Return whether the coordinates lie within the box."""
+        return (
+            self.south <= coordinates.latitude <= self.north
+            and self.west <= coordinates.longitude <= self.east
+        )
+
+
+@dataclass(slots=True)
+class AirQualityStatistics:
+    """Represents air quality statistics of a group of stations."""
+
+    stations: int
+    mean: float | None
+    percentiles: dict[float, float]
+    worst_station_id: int | None
+    worst_air_quality_index: int | None
+    dominant_pollutants: dict[Pollutant, int]
+
+
+def by_bounding_box(boxes: Mapping[str, BoundingBox]) -> GroupBy:
+    """Group readings by the first named bounding box containing them."""
+
+    def group_by(air_quality: WAQIAirQuality) -> str | None:
+        for name, box in boxes.items():
+            if box.contains(air_quality.city.coordinates):
+                return name
+        return None
+
+    return group_by
+
+
+@dataclass(slots=True)
+class _Group:
+    """Incrementally maintained state of a group."""
+
+    readings: dict[int, tuple[int | None, Pollutant | None]] = field(
+        default_factory=dict
+    )
+    ranked: list[tuple[int, int]] = field(default_factory=list)
+    total: int = 0
+    pollutants: Counter[Pollutant] = field(default_factory=Counter)
+
+    def add(
+        self, station_id: int, aqi: int | None, pollutant: Pollutant | None
+    ) -> None:
+        """Add the reading of a station."""
+        self.readings[station_id] = (aqi, pollutant)
+        if aqi is not None:
+            insort(self.ranked, (aqi, station_id))
+            self.total += aqi
+        if pollutant is not None:
+            self.pollutants[pollutant] += 1
+
+    def remove(self, station_id: int) -> None:
+        """Remove the reading of a station."""
+        aqi, pollutant = self.readings.pop(station_id)
+        if aqi is not None:
+            del self.ranked[bisect_left(self.ranked, (aqi, station_id))]
+            self.total -= aqi
+        if pollutant is not None:
+            self.pollutants[pollutant] -= 1
+            if not self.pollutants[pollutant]:
+                del self.pollutants[pollutant]
+
+    def statistics(self, percentiles: tuple[float, ...]) -> AirQualityStatistics:
+        """Return the statistics of the group."""
+        worst = self.ranked[-1] if self.ranked else None
+        return AirQualityStatistics(
+            stations=len(self.readings),
+            mean=self.total / len(self.ranked) if self.ranked else None,
+            percentiles={
+                percentile: _percentile(self.ranked, percentile)
+                for percentile in percentiles
+                if self.ranked
+            },
+            worst_station_id=worst[1] if worst else None,
+            worst_air_quality_index=worst[0] if worst else None,
+            dominant_pollutants=dict(self.pollutants),
+        )
+
+
+def _percentile(ranked: list[tuple[int, int]], percentile: float) -> float:
+    """Return a linearly interpolated percentile of ranked values."""
+    position = (len(ranked) - 1) * percentile / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ranked) - 1)
+    fraction = position - lower
+    return ranked[lower][0] + (ranked[upper][0] - ranked[lower][0]) * fraction
+
+
+class RegionAggregator:
+    """Maintain air quality statistics per region as readings arrive.
+
+    Every group keeps its air quality indices ranked, so adding or replacing
+    the reading of a station updates the statistics without recomputing
+    them over the whole batch.
+
+    WAQI does not report a region per station, so readings are grouped by
+    `group_by`, for example `by_bounding_box`. Readings it returns None for
+    are skipped.
+    """
+
+    def __init__(
+        self,
+        group_by: GroupBy,
+        *,
+        percentiles: tuple[float, ...] = (50, 90, 95),
+    ) -> None:
+        """Initialize the aggregator."""
+        self.group_by = group_by
+        self.percentiles = percentiles
+        self._groups: dict[Hashable, _Group] = {}
+        self._stations: dict[int, Hashable] = {}
+
+    def add(self, air_qualities: Iterable[WAQIAirQuality]) -> None:
+        """Add readings, replacing earlier readings of the same stations."""
+        for air_quality in air_qualities:
+            self.remove(air_quality.station_id)
+            if (group := self.group_by(air_quality)) is None:
+                continue
+            self._stations[air_quality.station_id] = group
+            self._groups.setdefault(group, _Group()).add(
+                air_quality.station_id,
+                air_quality.air_quality_index,
+                air_quality.dominant_pollutant,
+            )
+
+    def remove(self, station_id: int) -> None:
+        """Remove the reading of a station."""
+        if (group := self._stations.pop(station_id, None)) is None:
+            return
+        self._groups[group].remove(station_id)
+        if not self._groups[group].readings:
+            del self._groups[group]
+
+    def get(self, group: Hashable) -> AirQualityStatistics | None:
+        """Return the statistics of a group."""
+        if (state := self._groups.get(group)) is None:
+            return None
+        return state.statistics(self.percentiles)
+
+    def statistics(self) -> dict[Hashable, AirQualityStatistics]:
+        """Return the statistics of all groups."""
+        return {
+            group: state.statistics(self.percentiles)
+            for group, state in self._groups.items()
+        }
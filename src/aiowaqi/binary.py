@@ -0,0 +1,294 @@
+"""Asynchronous Python client for the WAQI API."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from datetime import UTC, datetime, timedelta, timezone
+import struct
+from typing import TYPE_CHECKING, cast
+
+from .exceptions import WAQISerializationError
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+    from typing import Self
+
+FORMAT_VERSION = 3
+
+_UINT8 = struct.Struct("<B")
+_UINT16 = struct.Struct("<H")
+_UINT32 = struct.Struct("<I")
+_INT32 = struct.Struct("<i")
+_INT64 = struct.Struct("<q")
+_FLOAT64 = struct.Struct("<d")
+_DATETIME_AWARE = struct.Struct("<qi")
+
+_NULL_STRING = 0xFFFF
+
+_DATETIME_NONE = 0
+_DATETIME_NAIVE = 1
+_DATETIME_AWARE_FLAG = 2
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_NAIVE_EPOCH = datetime(1970, 1, 1)  # noqa: DTZ001
+
+
+class BinaryWriter:
+    """Append-only writer for the compact binary layout."""
+
+    __slots__ = ("_buffer",)
+
+    def __init__(self) -> None:
+        """Initialize an empty buffer."""
+        self._buffer = bytearray()
+
+    def getvalue(self) -> bytes:
+        """Return the written bytes."""
+        return bytes(self._buffer)
+
+    def _pack(self, fmt: struct.Struct, *values: float) -> None:
+        """Pack values at the end of the buffer."""
+        try:
+            self._buffer += fmt.pack(*values)
+        except struct.error as exception:
+            msg = "Value is out of range to be serialized"
+            raise WAQISerializationError(msg) from exception
+
+    def write_uint8(self, value: int) -> None:
+        """Write an unsigned 8-bit integer."""
+        self._pack(_UINT8, value)
+
+    def write_uint16(self, value: int) -> None:
+        """Write an unsigned 16-bit integer."""
+        self._pack(_UINT16, value)
+
+    def write_uint32(self, value: int) -> None:
+        """Write an unsigned 32-bit integer."""
+        self._pack(_UINT32, value)
+
+    def write_int32(self, value: int) -> None:
+        """Write a signed 32-bit integer."""
+        self._pack(_INT32, value)
+
+    def write_float64(self, value: float) -> None:
+        """Write a 64-bit float."""
+        self._pack(_FLOAT64, value)
+
+    def write_string(self, value: str | None) -> None:
+        """Write a length-prefixed UTF-8 string, or a null marker."""
+        if value is None:
+            self._pack(_UINT16, _NULL_STRING)
+            return
+        encoded = value.encode()
+        if len(encoded) >= _NULL_STRING:
+            msg = "String is too long to be serialized"
+            raise WAQISerializationError(msg)
+        self._pack(_UINT16, len(encoded))
+        self._buffer += encoded
+
+    def write_bytes(self, value: bytes) -> None:
+        """Write length-prefixed bytes."""
+        self._pack(_UINT32, len(value))
+        self._buffer += value
+
+    def write_datetime(self, value: datetime | None) -> None:
+        """Write a datetime as microseconds since epoch plus its UTC offset."""
+        if value is None:
+            self.write_uint8(_DATETIME_NONE)
+            return
+        offset = value.utcoffset()
+        if offset is None:
+            self.write_uint8(_DATETIME_NAIVE)
+            self._pack(_INT64, (value - _NAIVE_EPOCH) // timedelta(0, 0, 1))
+            return
+        self.write_uint8(_DATETIME_AWARE_FLAG)
+        self._pack(
+            _DATETIME_AWARE,
+            (value - _EPOCH) // timedelta(0, 0, 1),
+            int(offset.total_seconds()),
+        )
+
+    def write_float_slots(self, present: int, values: Sequence[float]) -> None:
+        """Write up to 16 float slots as a presence bitmap and packed values.
+
+        The values are those of the present slots, in slot order.
+        """
+        self._pack(_UINT16, present)
+        self._pack(struct.Struct(f"<{len(values)}d"), *values)
+
+
+class BinaryReader:
+    """Sequential reader for the compact binary layout."""
+
+    __slots__ = ("_data", "_offset")
+
+    def __init__(self, data: bytes | bytearray | memoryview) -> None:
+        """Initialize the reader over a buffer."""
+        self._data = memoryview(data)
+        self._offset = 0
+
+    def _unpack(self, fmt: struct.Struct) -> tuple[int | float, ...]:
+        """Unpack a structure at the current offset."""
+        values = fmt.unpack_from(self._data, self._offset)
+        self._offset += fmt.size
+        return values
+
+    def read_uint8(self) -> int:
+        """Read an unsigned 8-bit integer."""
+        return int(self._unpack(_UINT8)[0])
+
+    def read_uint16(self) -> int:
+        """Read an unsigned 16-bit integer."""
+        return int(self._unpack(_UINT16)[0])
+
+    def read_uint32(self) -> int:
+        """Read an unsigned 32-bit integer."""
+        return int(self._unpack(_UINT32)[0])
+
+    def read_int32(self) -> int:
+        """Read a signed 32-bit integer."""
+        return int(self._unpack(_INT32)[0])
+
+    def read_float64(self) -> float:
+        """Read a 64-bit float."""
+        return float(self._unpack(_FLOAT64)[0])
+
+    def read_string(self) -> str | None:
+        """Read a length-prefixed UTF-8 string."""
+        length = self.read_uint16()
+        if length == _NULL_STRING:
+            return None
+        end = self._offset + length
+        if end > len(self._data):
+            msg = "Unexpected end of data"
+            raise WAQISerializationError(msg)
+        value = bytes(self._data[self._offset : end]).decode()
+        self._offset = end
+        return value
+
+    def read_bytes(self) -> bytes:
+        """Read length-prefixed bytes."""
+        end = self.read_uint32() + self._offset
+        if end > len(self._data):
+            msg = "Unexpected end of data"
+            raise WAQISerializationError(msg)
+        value = bytes(self._data[self._offset : end])
+        self._offset = end
+        return value
+
+    def read_required_string(self) -> str:
+        """Read a length-prefixed UTF-8 string that may not be null."""
+        value = self.read_string()
+        if value is None:
+            msg = "Unexpected null string"
+            raise WAQISerializationError(msg)
+        return value
+
+    def read_datetime(self) -> datetime | None:
+        """Read a datetime written by `BinaryWriter.write_datetime`."""
+        kind = self.read_uint8()
+        if kind == _DATETIME_NONE:
+            return None
+        if kind == _DATETIME_NAIVE:
+            micros = int(self._unpack(_INT64)[0])
+            return _NAIVE_EPOCH + timedelta(microseconds=micros)
+        if kind != _DATETIME_AWARE_FLAG:
+            msg = f"Unknown datetime marker {kind}"
+            raise WAQISerializationError(msg)
+        timestamp, offset = self._unpack(_DATETIME_AWARE)
+        return (_EPOCH + timedelta(microseconds=timestamp)).astimezone(
+            timezone(timedelta(seconds=offset))
+        )
+
+    def read_float_slots(self, count: int) -> tuple[int, tuple[float, ...]]:
+        """Read float slots written by `write_float_slots`."""
+        present = self.read_uint16()
+        if present >> count:
+            msg = "Unexpected float slot in bitmap"
+            raise WAQISerializationError(msg)
+        values = self._unpack(struct.Struct(f"<{present.bit_count()}d"))
+        return present, cast("tuple[float, ...]", values)
+
+    def read_version(self) -> None:
+        """Read and validate the format version header."""
+        version = self.read_uint8()
+        if version != FORMAT_VERSION:
+            msg = f"Unsupported serialization format version {version}"
+            raise WAQISerializationError(msg)
+
+    def ensure_consumed(self) -> None:
+        """Raise if there is trailing data left in the buffer."""
+        if self._offset != len(self._data):
+            msg = "Unexpected trailing data"
+            raise WAQISerializationError(msg)
+
+
+class BinarySerializable(ABC):
+    """Mixin adding compact binary serialization to a model."""
+
+    __slots__ = ()
+
+    @abstractmethod
+    def write(self, writer: BinaryWriter) -> None:
+        """Write the model to a binary writer."""
+
+    @classmethod
+    @abstractmethod
+    def read(cls, reader: BinaryReader) -> Self:
+        """Read the model from a binary reader."""
+
+    def to_bytes(self) -> bytes:
+        """Serialize the model to the compact binary format."""
+        writer = BinaryWriter()
+        writer.write_uint8(FORMAT_VERSION)
+        self.write(writer)
+        return writer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data: bytes | bytearray | memoryview) -> Self:
+        """Deserialize a model from the compact binary format."""
+        reader = BinaryReader(data)
+        try:
+            reader.read_version()
+            item = cls.read(reader)
+        except (
+            struct.error,
+            UnicodeDecodeError,
+            ValueError,
+            OverflowError,
+        ) as exception:
+            msg = f"Could not deserialize {cls.__name__}"
+            raise WAQISerializationError(msg) from exception
+        reader.ensure_consumed()
+        return item
+
+    @classmethod
+    def batch_to_bytes(cls, items: Iterable[Self]) -> bytes:
+        """Serialize a batch of models to the compact binary format."""
+        writer = BinaryWriter()
+        body = BinaryWriter()
+        count = 0
+        for item in items:
+            item.write(body)
+            count += 1
+        writer.write_uint8(FORMAT_VERSION)
+        writer.write_uint32(count)
+        return writer.getvalue() + body.getvalue()
+
+    @classmethod
+    def batch_from_bytes(cls, data: bytes | bytearray | memoryview) -> list[Self]:
+        """Deserialize a batch of models from the compact binary format."""
+        reader = BinaryReader(data)
+        try:
+            reader.read_version()
+            items = [cls.read(reader) for _ in range(reader.read_uint32())]
+        except (
+            struct.error,
+            UnicodeDecodeError,
+            ValueError,
+            OverflowError,
+        ) as exception:
+            msg = f"Could not deserialize batch of {cls.__name__}"
+            raise WAQISerializationError(msg) from exception
+        reader.ensure_consumed()
+        return items
@@ -0,0 +1,117 @@
+"""Asynchronous Python client for the WAQI API."""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+from enum import StrEnum
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .binary import BinaryReader, BinaryWriter
+
+
+class CircuitState(StrEnum):
+    """Enum of circuit breaker states."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass(slots=True)
+class CircuitBreaker:
+    """Tracks the health of a route and decides whether requests may be sent.
+
+    The breaker opens when the failure rate over the last `window_size`
+    calls reaches `failure_rate_threshold`. Calls slower than
+    `slow_call_duration` count as failures. After `reset_timeout` seconds
+    a limited amount of probe requests is let through; a successful probe
+    closes the breaker again, a failing one reopens it.
+    """
+
+    failure_rate_threshold: float = 0.5
+    minimum_calls: int = 10
+    window_size: int = 20
+    slow_call_duration: float | None = None
+    reset_timeout: float = 30.0
+    half_open_max_calls: int = 1
+    state: CircuitState = CircuitState.CLOSED
+    _outcomes: deque[bool] = field(init=False, repr=False)
+    _opened_at: float = field(default=0.0, init=False, repr=False)
+    _half_open_calls: int = field(default=0, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Initialize the window of outcomes."""
+        self._outcomes = deque(maxlen=self.window_size)
+
+    @property
+    def failure_rate(self) -> float:
+        """Return the failure rate over the current window."""
+        if not self._outcomes:
+            return 0.0
+        return sum(self._outcomes) / len(self._outcomes)
+
+    def allow_request(self) -> bool:
+        """Return whether a request may be sent, reserving a probe if needed."""
+        if self.state is CircuitState.OPEN:
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            self.state = CircuitState.HALF_OPEN
+            self._half_open_calls = 0
+        if self.state is CircuitState.HALF_OPEN:
+            if self._half_open_calls >= self.half_open_max_calls:
+                return False
+            self._half_open_calls += 1
+        return True
+
+    def record_success(self, duration: float) -> None:
+        """Record a successful call and its duration."""
+        if self.slow_call_duration is not None and duration > self.slow_call_duration:
+            self.record_failure()
+            return
+        if self.state is CircuitState.HALF_OPEN:
+            self.state = CircuitState.CLOSED
+            self._outcomes.clear()
+            return
+        self._outcomes.append(False)
+
+    def record_failure(self) -> None:
+        """Record a failed call."""
+        if self.state is CircuitState.OPEN:
+            return
+        self._outcomes.append(True)
+        if self.state is CircuitState.HALF_OPEN or (
+            len(self._outcomes) >= self.minimum_calls
+            and self.failure_rate >= self.failure_rate_threshold
+        ):
+            self.state = CircuitState.OPEN
+            self._opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """Release a probe reservation of a call that did not complete."""
+        if self.state is CircuitState.HALF_OPEN and self._half_open_calls:
+            self._half_open_calls -= 1
+
+    def write_state(self, writer: BinaryWriter) -> None:
+        """Write the state and window of outcomes to a binary writer."""
+        writer.write_string(self.state.value)
+        writer.write_uint16(len(self._outcomes))
+        for outcome in self._outcomes:
+            writer.write_uint8(outcome)
+        writer.write_float64(self._opened_at + time.time() - time.monotonic())
+
+    def read_state(self, reader: BinaryReader) -> None:
+        """Restore the state written by `write_state`.
+
+        Probe reservations are not restored, as their calls did not survive.
+        """
+        state = CircuitState(reader.read_required_string())
+        outcomes = [bool(reader.read_uint8()) for _ in range(reader.read_uint16())]
+        opened_at = reader.read_float64() - time.time() + time.monotonic()
+        self.state = state
+        self._outcomes.clear()
+        self._outcomes.extend(outcomes)
+        self._opened_at = opened_at
+        self._half_open_calls = 0
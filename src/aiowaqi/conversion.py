@@ -0,0 +1,297 @@
+"""Asynchronous Python client for the WAQI API."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import TYPE_CHECKING
+
+from .models import DailyForecast, Pollutant
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Mapping, Sequence
+
+    from .models import WAQIExtendedAirQuality
+
+type Breakpoints = tuple[tuple[float, float, float, float], ...]
+
+
+class AirQualityScale(StrEnum):
+    """Enum of air quality scales."""
+
+    US_EPA = "us_epa"
+    EUROPEAN = "european"
+
+
+@dataclass(slots=True)
+class ConvertedAirQuality:
+    """Represents air quality converted to another scale."""
+
+    scale: AirQualityScale
+    indices: dict[Pollutant, int]
+    air_quality_index: int | None
+    dominant_pollutant: Pollutant | None
+
+
+def _table(breakpoints: Breakpoints) -> Callable[[float], float]:
+    """Return a piecewise linear mapping of (low, high, mapped low, mapped high) rows.
+
+    The slopes of the segments are computed up front, and values beyond the
+    last segment are clamped to it.
+    """
+    upper = tuple(row[1] for row in breakpoints)
+    segments = tuple(
+        (low, mapped_low, (mapped_high - mapped_low) / (high - low))
+        for low, high, mapped_low, mapped_high in breakpoints
+    )
+
+    def mapping(value: float) -> float:
+        index = bisect_left(upper, value)
+        if index == len(upper):
+            index -= 1
+            value = upper[index]
+        low, mapped_low, slope = segments[index]
+        return mapped_low + (value - low) * slope
+
+    return mapping
+
+
+# Concentrations are in µg/m³ for particulate matter, ppb for ozone, nitrogen
+# dioxide and sulfur dioxide, and ppm for carbon monoxide.
+
+# The breakpoints WAQI computes its sub-indices with.
+_WAQI_BREAKPOINTS: dict[Pollutant, Breakpoints] = {
+    Pollutant.PM25: (
+        (0.0, 12.0, 0, 50),
+        (12.1, 35.4, 51, 100),
+        (35.5, 55.4, 101, 150),
+        (55.5, 150.4, 151, 200),
+        (150.5, 250.4, 201, 300),
+        (250.5, 350.4, 301, 400),
+        (350.5, 500.4, 401, 500),
+    ),
+    Pollutant.PM10: (
+        (0, 54, 0, 50),
+        (55, 154, 51, 100),
+        (155, 254, 101, 150),
+        (255, 354, 151, 200),
+        (355, 424, 201, 300),
+        (425, 504, 301, 400),
+        (505, 604, 401, 500),
+    ),
+    Pollutant.OZONE: (
+        (0, 54, 0, 50),
+        (55, 70, 51, 100),
+        (71, 85, 101, 150),
+        (86, 105, 151, 200),
+        (106, 200, 201, 300),
+    ),
+    Pollutant.NITROGEN_DIOXIDE: (
+        (0, 53, 0, 50),
+        (54, 100, 51, 100),
+        (101, 360, 101, 150),
+        (361, 649, 151, 200),
+        (650, 1249, 201, 300),
+        (1250, 1649, 301, 400),
+        (1650, 2049, 401, 500),
+    ),
+    Pollutant.SULFUR_DIOXIDE: (
+        (0, 35, 0, 50),
+        (36, 75, 51, 100),
+        (76, 185, 101, 150),
+        (186, 304, 151, 200),
+        (305, 604, 201, 300),
+        (605, 804, 301, 400),
+        (805, 1004, 401, 500),
+    ),
+    Pollutant.CARBON_MONOXIDE: (
+        (0.0, 4.4, 0, 50),
+        (4.5, 9.4, 51, 100),
+        (9.5, 12.4, 101, 150),
+        (12.5, 15.4, 151, 200),
+        (15.5, 30.4, 201, 300),
+        (30.5, 40.4, 301, 400),
+        (40.5, 50.4, 401, 500),
+    ),
+}
+
+# The breakpoints of the US EPA as revised in 2024.
+_US_EPA_BREAKPOINTS: dict[Pollutant, Breakpoints] = _WAQI_BREAKPOINTS | {
+    Pollutant.PM25: (
+        (0.0, 9.0, 0, 50),
+        (9.1, 35.4, 51, 100),
+        (35.5, 55.4, 101, 150),
+        (55.5, 125.4, 151, 200),
+        (125.5, 225.4, 201, 300),
+        (225.5, 325.4, 301, 500),
+    ),
+    Pollutant.PM10: (*_WAQI_BREAKPOINTS[Pollutant.PM10][:5], (425, 604, 301, 500)),
+    Pollutant.NITROGEN_DIOXIDE: (
+        *_WAQI_BREAKPOINTS[Pollutant.NITROGEN_DIOXIDE][:5],
+        (1250, 2049, 301, 500),
+    ),
+    Pollutant.SULFUR_DIOXIDE: (
+        *_WAQI_BREAKPOINTS[Pollutant.SULFUR_DIOXIDE][:5],
+        (605, 1004, 301, 500),
+    ),
+    Pollutant.CARBON_MONOXIDE: (
+        *_WAQI_BREAKPOINTS[Pollutant.CARBON_MONOXIDE][:5],
+        (30.5, 50.4, 301, 500),
+    ),
+}
+
+# The upper bounds in µg/m³ of the first five bands of the European Air
+# Quality Index, with the factor converting the concentrations above.
+_EUROPEAN_BANDS: dict[Pollutant, tuple[tuple[float, ...], float]] = {
+    Pollutant.PM25: ((10, 20, 25, 50, 75), 1.0),
+    Pollutant.PM10: ((20, 40, 50, 100, 150), 1.0),
+    Pollutant.OZONE: ((50, 100, 130, 240, 380), 48.00 / 24.45),
+    Pollutant.NITROGEN_DIOXIDE: ((40, 90, 120, 230, 340), 46.01 / 24.45),
+    Pollutant.SULFUR_DIOXIDE: ((100, 200, 350, 500, 750), 64.07 / 24.45),
+}
+
+_TO_CONCENTRATION: dict[Pollutant, Callable[[float], float]] = {
+    pollutant: _table(tuple((*row[2:], *row[:2]) for row in breakpoints))
+    for pollutant, breakpoints in _WAQI_BREAKPOINTS.items()
+}
+
+
+def _us_epa_converter(pollutant: Pollutant) -> Callable[[float], int]:
+    """Return a converter of WAQI sub-indices to US EPA sub-indices."""
+    to_concentration = _TO_CONCENTRATION[pollutant]
+    to_index = _table(_US_EPA_BREAKPOINTS[pollutant])
+
+    def converter(value: float) -> int:
+        return round(to_index(to_concentration(value)))
+
+    return converter
+
+
+def _european_converter(pollutant: Pollutant) -> Callable[[float], int]:
+    """Return a converter of WAQI sub-indices to European bands.
+
+    The bounds of the bands are mapped to WAQI sub-indices up front, so a
+    conversion is a single bisection.
+    """
+    bounds, factor = _EUROPEAN_BANDS[pollutant]
+    to_index = _table(_WAQI_BREAKPOINTS[pollutant])
+    index_bounds = tuple(to_index(bound / factor) for bound in bounds)
+
+    def converter(value: float) -> int:
+        return bisect_left(index_bounds, value) + 1
+
+    return converter
+
+
+_CONVERTERS: dict[AirQualityScale, dict[Pollutant, Callable[[float], int]]] = {
+    AirQualityScale.US_EPA: {
+        pollutant: _us_epa_converter(pollutant) for pollutant in _US_EPA_BREAKPOINTS
+    },
+    AirQualityScale.EUROPEAN: {
+        pollutant: _european_converter(pollutant) for pollutant in _EUROPEAN_BANDS
+    },
+}
+
+
+def concentration(pollutant: Pollutant, value: float) -> float | None:
+    """Return the concentration a WAQI sub-index was computed from.
+
+    Concentrations are in µg/m³ for particulate matter, ppb for ozone,
+    nitrogen dioxide and sulfur dioxide, and ppm for carbon monoxide.
+    """
+    if (table := _TO_CONCENTRATION.get(pollutant)) is None:
+        return None
+    return table(value)
+
+
+def convert_index(
+    pollutant: Pollutant, value: float, scale: AirQualityScale
+) -> int | None:
+    """Convert a WAQI sub-index, or return None if the scale lacks the pollutant."""
+    if (converter := _CONVERTERS[scale].get(pollutant)) is None:
+        return None
+    return converter(value)
+
+
+def _summarize(
+    scale: AirQualityScale, indices: dict[Pollutant, int]
+) -> ConvertedAirQuality:
+    """Return the converted air quality of the sub-indices of a reading."""
+    dominant_pollutant = max(indices, key=indices.__getitem__, default=None)
+    return ConvertedAirQuality(
+        scale=scale,
+        indices=indices,
+        air_quality_index=(
+            indices[dominant_pollutant] if dominant_pollutant is not None else None
+        ),
+        dominant_pollutant=dominant_pollutant,
+    )
+
+
+def convert(
+    air_quality: WAQIExtendedAirQuality, scale: AirQualityScale
+) -> ConvertedAirQuality:
+    """Convert the sub-indices of a reading to a scale."""
+    indices: dict[Pollutant, int] = {}
+    for pollutant, converter in _CONVERTERS[scale].items():
+        if (value := air_quality.get(pollutant)) is not None:
+            indices[pollutant] = converter(value)
+    return _summarize(scale, indices)
+
+
+def convert_batch(
+    air_qualities: Sequence[WAQIExtendedAirQuality], scale: AirQualityScale
+) -> list[ConvertedAirQuality]:
+    """Convert the sub-indices of many readings to a scale.
+
+    Readings reporting the same keys share their layout, so the converters
+    and value positions are resolved once per layout instead of per reading.
+    """
+    converters = _CONVERTERS[scale]
+    columns: dict[tuple[str, ...], list[tuple[Pollutant, Callable[[float], int], int]]]
+    columns = {}
+    results: list[ConvertedAirQuality] = []
+    for air_quality in air_qualities:
+        keys = air_quality.keys
+        if (layout := columns.get(keys)) is None:
+            layout = columns[keys] = [
+                (pollutant, converter, keys.index(pollutant))
+                for pollutant, converter in converters.items()
+                if pollutant in keys
+            ]
+        values = air_quality.values
+        results.append(
+            _summarize(
+                scale,
+                {
+                    pollutant: converter(value)
+                    for pollutant, converter, position in layout
+                    if (value := values[position]) is not None
+                },
+            )
+        )
+    return results
+
+
+def convert_forecast(
+    forecast: Mapping[str, Iterable[DailyForecast]], scale: AirQualityScale
+) -> dict[Pollutant, list[DailyForecast]]:
+    """Convert the daily forecasts of the pollutants the scale covers."""
+    converters = _CONVERTERS[scale]
+    result: dict[Pollutant, list[DailyForecast]] = {}
+    for key, forecasts in forecast.items():
+        if key not in converters:
+            continue
+        pollutant = Pollutant(key)
+        converter = converters[pollutant]
+        result[pollutant] = [
+            DailyForecast(
+                day=daily.day,
+                average=converter(daily.average),
+                minimum=converter(daily.minimum),
+                maximum=converter(daily.maximum),
+            )
+            for daily in forecasts
+        ]
+    return result
@@ -9,6 +9,10 @@ class WAQIConnectionError(WAQIError):
     """WAQI connection exception."""
 
 
+class WAQICircuitOpenError(WAQIConnectionError):
+    """WAQI circuit breaker open exception."""
+
+
 class WAQIUnknownCityError(WAQIError):
     """WAQI unknown city exception."""
 
@@ -19,3 +23,7 @@ class WAQIUnknownStationError(WAQIError):
 
 class WAQIAuthenticationError(WAQIError):
     """WAQI authentication exception."""
+
+
+class WAQISerializationError(WAQIError):
+    """WAQI serialization exception."""
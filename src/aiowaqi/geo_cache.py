@@ -0,0 +1,148 @@
+"""Asynchronous Python client for the WAQI API."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+import math
+import time
+from typing import TYPE_CHECKING
+
+from .models import WAQIAirQuality
+
+if TYPE_CHECKING:
+    from .binary import BinaryReader, BinaryWriter
+
+type Cell = tuple[int, int]
+
+
+class GeoCache:
+    """Cache of coordinate lookups quantized to a grid.
+
+    Every grid cell records the station its coordinates resolved to, so
+    nearby lookups share one cached reading per station. Cells and readings
+    are evicted least recently used first, and readings expire after `ttl`
+    seconds while the cell keeps pointing at its station.
+    """
+
+    def __init__(
+        self,
+        *,
+        resolution: float = 0.01,
+        max_cells: int = 10000,
+        ttl: float = 900.0,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+        ----
+            resolution: the size of a grid cell in degrees.
+            max_cells: the maximum amount of cells and readings to keep.
+            ttl: the time in seconds a reading is considered fresh.
+
+        """
+        self.resolution = resolution
+        self.max_cells = max_cells
+        self.ttl = ttl
+        self._cells: OrderedDict[Cell, int] = OrderedDict()
+        self._readings: OrderedDict[int, tuple[float, WAQIAirQuality]] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the amount of cached cells."""
+        return len(self._cells)
+
+    def cell(self, latitude: float, longitude: float) -> Cell:
+        """Return the grid cell of coordinates."""
+        return (
+            math.floor(latitude / self.resolution),
+            math.floor(longitude / self.resolution),
+        )
+
+    def get_station(self, latitude: float, longitude: float) -> int | None:
+        """Return the station the cell of the coordinates resolved to."""
+        cell = self.cell(latitude, longitude)
+        if (station_id := self._cells.get(cell)) is not None:
+            self._cells.move_to_end(cell)
+        return station_id
+
+    def get_reading(self, station_id: int) -> WAQIAirQuality | None:
+        """Return the cached reading of a station if it is still fresh."""
+        if (entry := self._readings.get(station_id)) is None:
+            return None
+        fetched_at, air_quality = entry
+        if time.monotonic() - fetched_at >= self.ttl:
+            del self._readings[station_id]
+            return None
+        self._readings.move_to_end(station_id)
+        return air_quality
+
+    def get(self, latitude: float, longitude: float) -> WAQIAirQuality | None:
+        """Return the fresh cached reading for coordinates."""
+        if (station_id := self.get_station(latitude, longitude)) is None:
+            return None
+        return self.get_reading(station_id)
+
+    def add(
+        self,
+        latitude: float,
+        longitude: float,
+        air_quality: WAQIAirQuality,
+    ) -> None:
+        """Record the reading the coordinates resolved to."""
+        cell = self.cell(latitude, longitude)
+        self._cells[cell] = air_quality.station_id
+        self._cells.move_to_end(cell)
+        while len(self._cells) > self.max_cells:
+            self._cells.popitem(last=False)
+        self.add_reading(air_quality)
+
+    def discard(self, latitude: float, longitude: float) -> None:
+        """Forget the station the cell of the coordinates resolved to."""
+        self._cells.pop(self.cell(latitude, longitude), None)
+
+    def add_reading(self, air_quality: WAQIAirQuality) -> None:
+        """Record a fresh reading of a station."""
+        self._readings[air_quality.station_id] = (time.monotonic(), air_quality)
+        self._readings.move_to_end(air_quality.station_id)
+        while len(self._readings) > self.max_cells:
+            self._readings.popitem(last=False)
+
+    def write_state(self, writer: BinaryWriter) -> None:
+        """Write the cells and readings to a binary writer."""
+        offset = time.time() - time.monotonic()
+        writer.write_float64(self.resolution)
+        writer.write_uint32(len(self._cells))
+        for (latitude, longitude), station_id in self._cells.items():
+            writer.write_int32(latitude)
+            writer.write_int32(longitude)
+            writer.write_int32(station_id)
+        writer.write_uint32(len(self._readings))
+        for fetched_at, air_quality in self._readings.values():
+            writer.write_float64(fetched_at + offset)
+            air_quality.write(writer)
+
+    def read_state(self, reader: BinaryReader) -> None:
+        """Restore the cells and fresh readings written by `write_state`.
+
+        Cells are only restored when they were written with the same
+        resolution.
+        """
+        offset = time.time() - time.monotonic()
+        resolution = reader.read_float64()
+        cells = [
+            ((reader.read_int32(), reader.read_int32()), reader.read_int32())
+            for _ in range(reader.read_uint32())
+        ]
+        if resolution == self.resolution:
+            for cell, station_id in cells:
+                self._cells[cell] = station_id
+                self._cells.move_to_end(cell)
+            while len(self._cells) > self.max_cells:
+                self._cells.popitem(last=False)
+        for _ in range(reader.read_uint32()):
+            fetched_at = reader.read_float64() - offset
+            air_quality = WAQIAirQuality.read(reader)
+            if time.monotonic() - fetched_at < self.ttl:
+                self._readings[air_quality.station_id] = (fetched_at, air_quality)
+                self._readings.move_to_end(air_quality.station_id)
+        while len(self._readings) > self.max_cells:
+            self._readings.popitem(last=False)
@@ -2,13 +2,15 @@
 
 from __future__ import annotations
 
-from contextlib import suppress
-from dataclasses import dataclass
-from datetime import datetime
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass, field
+from datetime import date, datetime
 from enum import StrEnum
 from typing import Any, Self
 
-from aiowaqi.util import to_nullable_enum
+from aiowaqi.binary import BinaryReader, BinarySerializable, BinaryWriter
+from aiowaqi.exceptions import WAQIError
+from aiowaqi.util import to_nullable_enum, to_nullable_int
 
 
 class Pollutant(StrEnum):
@@ -23,8 +25,36 @@ class Pollutant(StrEnum):
     NEPHELOMETRY = "neph"
 
 
+class Weather(StrEnum):
+    """Enum of weather conditions."""
+
+    DEW_POINT = "dew"
+    HUMIDITY = "h"
+    PRESSURE = "p"
+    TEMPERATURE = "t"
+    UV_INDEX = "uvi"
+    WIND = "w"
+    WIND_GUST = "wg"
+
+
+IAQI_SLOTS: dict[str, int] = {
+    key.value: index for index, key in enumerate((*Pollutant, *Weather))
+}
+_MAX_KEY_LAYOUTS = 1024
+_key_layouts: dict[tuple[str, ...], tuple[str, ...]] = {}
+
+
+def _intern_keys(keys: tuple[str, ...]) -> tuple[str, ...]:
+    """Return a shared instance of a layout of index keys."""
+    if (interned := _key_layouts.get(keys)) is not None:
+        return interned
+    if len(_key_layouts) < _MAX_KEY_LAYOUTS:
+        _key_layouts[keys] = keys
+    return keys
+
+
 @dataclass(slots=True)
-class Attribution:
+class Attribution(BinarySerializable):
     """Represents an attribution."""
 
     url: str
@@ -40,17 +70,42 @@ class Attribution:
             logo=attribution.get("logo"),
         )
 
+    def write(self, writer: BinaryWriter) -> None:
+        """Write the attribution to a binary writer."""
+        writer.write_string(self.url)
+        writer.write_string(self.name)
+        writer.write_string(self.logo)
+
+    @classmethod
+    def read(cls, reader: BinaryReader) -> Self:
+        """Read an attribution from a binary reader."""
+        return cls(
+            url=reader.read_required_string(),
+            name=reader.read_required_string(),
+            logo=reader.read_string(),
+        )
+
 
 @dataclass(slots=True)
-class Coordinates:
+class Coordinates(BinarySerializable):
     """Represents coordinates."""
 
     latitude: float
     longitude: float
 
+    def write(self, writer: BinaryWriter) -> None:
+        """Write the coordinates to a binary writer."""
+        writer.write_float64(self.latitude)
+        writer.write_float64(self.longitude)
+
+    @classmethod
+    def read(cls, reader: BinaryReader) -> Self:
+        """Read coordinates from a binary reader."""
+        return cls(latitude=reader.read_float64(), longitude=reader.read_float64())
+
 
 @dataclass(slots=True)
-class Location:
+class Location(BinarySerializable):
     """Represents a location object."""
 
     external_url: str
@@ -69,6 +124,21 @@ class Location:
             ),
         )
 
+    def write(self, writer: BinaryWriter) -> None:
+        """Write the location to a binary writer."""
+        writer.write_string(self.external_url)
+        writer.write_string(self.name)
+        self.coordinates.write(writer)
+
+    @classmethod
+    def read(cls, reader: BinaryReader) -> Self:
+        """Read a location from a binary reader."""
+        return cls(
+            external_url=reader.read_required_string(),
+            name=reader.read_required_string(),
+            coordinates=Coordinates.read(reader),
+        )
+
 
 @dataclass(slots=True)
 class City(Location):
@@ -92,46 +162,262 @@ class City(Location):
             location=loc,
         )
 
+    def write(self, writer: BinaryWriter) -> None:
+        """Write the city to a binary writer."""
+        writer.write_string(self.external_url)
+        writer.write_string(self.name)
+        self.coordinates.write(writer)
+        writer.write_string(self.location)
+
+    @classmethod
+    def read(cls, reader: BinaryReader) -> Self:
+        """Read a city from a binary reader."""
+        return cls(
+            external_url=reader.read_required_string(),
+            name=reader.read_required_string(),
+            coordinates=Coordinates.read(reader),
+            location=reader.read_string(),
+        )
+
 
 @dataclass(slots=True)
 class Station(Location):
     """Represents a station object."""
 
 
-@dataclass(slots=True)
-class WAQIExtendedAirQuality:
-    """Represents extended air quality data."""
-
-    carbon_monoxide: float | None
-    humidity: float | None
-    nephelometry: float | None
-    nitrogen_dioxide: float | None
-    ozone: float | None
-    pressure: float | None
-    sulfur_dioxide: float | None
-    pm10: float | None
-    pm25: float | None
-    temperature: float | None
+@dataclass(slots=True, eq=False)
+class WAQIExtendedAirQuality(BinarySerializable):
+    """Represents extended air quality data.
+
+    Only the reported values are stored, in the order of their index keys in
+    `keys`, with None for keys reported without a value. Readings reporting
+    the same keys share one `keys` tuple. The named values, such as `pm25`,
+    are properties, so `dataclasses.asdict` holds `keys` and `values` only;
+    use `to_dict` for the values keyed by index key.
+    """
+
+    keys: tuple[str, ...]
+    values: tuple[float | None, ...]
+
+    __hash__ = None  # type: ignore[assignment]
 
     @classmethod
     def from_dict(cls, air_quality: dict[str, Any]) -> Self:
         """Initialize from a dict."""
+        keys = tuple(air_quality)
         return cls(
-            carbon_monoxide=air_quality.get("co", {}).get("v"),
-            humidity=air_quality.get("h", {}).get("v"),
-            nephelometry=air_quality.get("neph", {}).get("v"),
-            nitrogen_dioxide=air_quality.get("no2", {}).get("v"),
-            ozone=air_quality.get("o3", {}).get("v"),
-            pressure=air_quality.get("p", {}).get("v"),
-            sulfur_dioxide=air_quality.get("so2", {}).get("v"),
-            pm10=air_quality.get("pm10", {}).get("v"),
-            pm25=air_quality.get("pm25", {}).get("v"),
-            temperature=air_quality.get("t", {}).get("v"),
+            keys=_key_layouts.get(keys) or _intern_keys(keys),
+            values=tuple(entry.get("v") for entry in air_quality.values()),
         )
 
+    def __eq__(self, other: object) -> bool:
+        """Return whether both report the same values."""
+        if not isinstance(other, WAQIExtendedAirQuality):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def get(self, key: str) -> float | None:
+        """Return the value of an index key, or None if it was not reported."""
+        try:
+            return self.values[self.keys.index(key)]
+        except ValueError:
+            return None
+
+    def to_dict(self) -> dict[str, float]:
+        """Return all reported values keyed by their index key."""
+        return {
+            key: value
+            for key, value in zip(self.keys, self.values, strict=True)
+            if value is not None
+        }
+
+    @property
+    def unknown(self) -> dict[str, float]:
+        """Return the reported values of index keys that are not known."""
+        return {
+            key: value
+            for key, value in zip(self.keys, self.values, strict=True)
+            if value is not None and key not in IAQI_SLOTS
+        }
+
+    @property
+    def carbon_monoxide(self) -> float | None:
+        """Return the carbon monoxide."""
+        return self.get(Pollutant.CARBON_MONOXIDE)
+
+    @property
+    def dew_point(self) -> float | None:
+        """Return the dew point."""
+        return self.get(Weather.DEW_POINT)
+
+    @property
+    def humidity(self) -> float | None:
+        """Return the humidity."""
+        return self.get(Weather.HUMIDITY)
+
+    @property
+    def nephelometry(self) -> float | None:
+        """Return the nephelometry."""
+        return self.get(Pollutant.NEPHELOMETRY)
+
+    @property
+    def nitrogen_dioxide(self) -> float | None:
+        """Return the nitrogen dioxide."""
+        return self.get(Pollutant.NITROGEN_DIOXIDE)
+
+    @property
+    def ozone(self) -> float | None:
+        """Return the ozone."""
+        return self.get(Pollutant.OZONE)
+
+    @property
+    def pressure(self) -> float | None:
+        """Return the pressure."""
+        return self.get(Weather.PRESSURE)
+
+    @property
+    def sulfur_dioxide(self) -> float | None:
+        """Return the sulfur dioxide."""
+        return self.get(Pollutant.SULFUR_DIOXIDE)
+
+    @property
+    def pm10(self) -> float | None:
+        """Return the PM10."""
+        return self.get(Pollutant.PM10)
+
+    @property
+    def pm25(self) -> float | None:
+        """Return the PM2.5."""
+        return self.get(Pollutant.PM25)
+
+    @property
+    def temperature(self) -> float | None:
+        """Return the temperature."""
+        return self.get(Weather.TEMPERATURE)
+
+    @property
+    def uv_index(self) -> float | None:
+        """Return the UV index."""
+        return self.get(Weather.UV_INDEX)
+
+    @property
+    def wind(self) -> float | None:
+        """Return the wind speed."""
+        return self.get(Weather.WIND)
+
+    @property
+    def wind_gust(self) -> float | None:
+        """Return the wind gust."""
+        return self.get(Weather.WIND_GUST)
+
+    def write(self, writer: BinaryWriter) -> None:
+        """Write the extended air quality to a binary writer."""
+        present = 0
+        known: list[tuple[int, float]] = []
+        unknown: list[tuple[str, float]] = []
+        for key, value in self.to_dict().items():
+            if (index := IAQI_SLOTS.get(key)) is None:
+                unknown.append((key, value))
+            else:
+                present |= 1 << index
+                known.append((index, value))
+        known.sort()
+        writer.write_float_slots(present, [value for _, value in known])
+        writer.write_uint8(len(unknown))
+        for key, value in unknown:
+            writer.write_string(key)
+            writer.write_float64(value)
+
+    @classmethod
+    def read(cls, reader: BinaryReader) -> Self:
+        """Read extended air quality from a binary reader."""
+        present, known = reader.read_float_slots(len(IAQI_SLOTS))
+        keys = [key for key, index in IAQI_SLOTS.items() if present & (1 << index)]
+        values = list(known)
+        for _ in range(reader.read_uint8()):
+            keys.append(reader.read_required_string())
+            values.append(reader.read_float64())
+        return cls(keys=_intern_keys(tuple(keys)), values=tuple(values))
+
 
 @dataclass(slots=True)
-class WAQIAirQuality:
+class DailyForecast(BinarySerializable):
+    """Represents the forecast of an index for a day."""
+
+    day: date
+    average: float
+    minimum: float
+    maximum: float
+
+    @classmethod
+    def from_dict(cls, forecast: dict[str, Any]) -> Self:
+        """Initialize from a dict."""
+        return cls(
+            day=date.fromisoformat(forecast["day"]),
+            average=forecast["avg"],
+            minimum=forecast["min"],
+            maximum=forecast["max"],
+        )
+
+    def write(self, writer: BinaryWriter) -> None:
+        """Write the forecast to a binary writer."""
+        writer.write_int32(self.day.toordinal())
+        writer.write_float64(self.average)
+        writer.write_float64(self.minimum)
+        writer.write_float64(self.maximum)
+
+    @classmethod
+    def read(cls, reader: BinaryReader) -> Self:
+        """Read a forecast from a binary reader."""
+        return cls(
+            day=date.fromordinal(reader.read_int32()),
+            average=reader.read_float64(),
+            minimum=reader.read_float64(),
+            maximum=reader.read_float64(),
+        )
+
+
+class DailyForecasts(Mapping[str, list[DailyForecast]]):
+    """Represents the daily forecasts per index.
+
+    The forecasts of an index are parsed when it is first looked up, as most
+    readings are used without their forecasts.
+    """
+
+    __slots__ = ("_daily",)
+
+    def __init__(self, daily: Mapping[str, list[Any]] | None = None) -> None:
+        """Initialize from forecasts per index, as received or parsed."""
+        self._daily: dict[str, list[Any]] = dict(daily) if daily else {}
+
+    def __getitem__(self, key: str) -> list[DailyForecast]:
+        """Return the forecasts of an index, parsing them if needed."""
+        forecasts = self._daily[key]
+        if forecasts and isinstance(forecasts[0], dict):
+            try:
+                parsed = [DailyForecast.from_dict(forecast) for forecast in forecasts]
+            except KeyError as exception:
+                # A KeyError would read as a missing index to the Mapping API.
+                msg = f"Malformed {key} forecast, missing {exception}"
+                raise WAQIError(msg) from exception
+            forecasts = self._daily[key] = parsed
+        return forecasts
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the indices."""
+        return iter(self._daily)
+
+    def __len__(self) -> int:
+        """Return the amount of indices."""
+        return len(self._daily)
+
+    def __repr__(self) -> str:
+        """Return the representation of the parsed forecasts."""
+        return f"{type(self).__name__}({dict(self)!r})"
+
+
+@dataclass(slots=True)
+class WAQIAirQuality(BinarySerializable):
     """Represents the air quality data from WAQI."""
 
     air_quality_index: int | None
@@ -141,14 +427,11 @@ class WAQIAirQuality:
     extended_air_quality: WAQIExtendedAirQuality
     dominant_pollutant: Pollutant | None
     measured_at: datetime | None
+    forecast: DailyForecasts = field(default_factory=DailyForecasts)
 
     @classmethod
     def from_dict(cls, air_quality: dict[str, Any]) -> Self:
         """Initialize from a dict."""
-        aqi = None
-        with suppress(ValueError):
-            aqi = int(air_quality["aqi"])
-
         dominant_pollutant = air_quality["dominentpol"]
         if dominant_pollutant == "":
             dominant_pollutant = None
@@ -160,7 +443,7 @@ class WAQIAirQuality:
             measured_at = datetime.fromisoformat(air_quality["time"]["iso"])
 
         return cls(
-            air_quality_index=aqi,
+            air_quality_index=to_nullable_int(air_quality["aqi"]),
             station_id=air_quality["idx"],
             attributions=[
                 Attribution.from_dict(attribution)
@@ -170,11 +453,61 @@ class WAQIAirQuality:
             extended_air_quality=WAQIExtendedAirQuality.from_dict(air_quality["iaqi"]),
             dominant_pollutant=dominant_pollutant,
             measured_at=measured_at,
+            forecast=DailyForecasts(air_quality.get("forecast", {}).get("daily")),
+        )
+
+    def write(self, writer: BinaryWriter) -> None:
+        """Write the air quality to a binary writer."""
+        _write_aqi(writer, self.air_quality_index)
+        writer.write_int32(self.station_id)
+        writer.write_uint16(len(self.attributions))
+        for attribution in self.attributions:
+            attribution.write(writer)
+        self.city.write(writer)
+        self.extended_air_quality.write(writer)
+        writer.write_string(
+            self.dominant_pollutant.value if self.dominant_pollutant else None
+        )
+        writer.write_datetime(self.measured_at)
+        writer.write_uint8(len(self.forecast))
+        for key, forecasts in self.forecast.items():
+            writer.write_string(key)
+            writer.write_uint16(len(forecasts))
+            for forecast in forecasts:
+                forecast.write(writer)
+
+    @classmethod
+    def read(cls, reader: BinaryReader) -> Self:
+        """Read air quality from a binary reader."""
+        aqi = _read_aqi(reader)
+        station_id = reader.read_int32()
+        attributions = [Attribution.read(reader) for _ in range(reader.read_uint16())]
+        city = City.read(reader)
+        extended_air_quality = WAQIExtendedAirQuality.read(reader)
+        dominant_pollutant = reader.read_string()
+        measured_at = reader.read_datetime()
+        forecast: dict[str, list[DailyForecast]] = {}
+        for _ in range(reader.read_uint8()):
+            key = reader.read_required_string()
+            forecast[key] = [
+                DailyForecast.read(reader) for _ in range(reader.read_uint16())
+            ]
+        return cls(
+            air_quality_index=aqi,
+            station_id=station_id,
+            attributions=attributions,
+            city=city,
+            extended_air_quality=extended_air_quality,
+            dominant_pollutant=(
+                Pollutant(dominant_pollutant) if dominant_pollutant else None
+            ),
+            measured_at=measured_at,
+            forecast=DailyForecasts(forecast),
         )
 
 
 @dataclass(slots=True)
-class WAQISearchResult:
+class WAQISearchResult(BinarySerializable):
     """Represents a search result from the WAQI api."""
 
     air_quality_index: int | None
@@ -184,12 +517,37 @@ class WAQISearchResult:
     @classmethod
     def from_dict(cls, result: dict[str, Any]) -> Self:
         """Initialize from a dict."""
-        aqi = None
-        with suppress(ValueError):
-            aqi = int(result["aqi"])
-
         return cls(
-            air_quality_index=aqi,
+            air_quality_index=to_nullable_int(result["aqi"]),
             station_id=result["uid"],
             station=Station.from_dict(result["station"]),
         )
+
+    def write(self, writer: BinaryWriter) -> None:
+        """Write the search result to a binary writer."""
+        _write_aqi(writer, self.air_quality_index)
+        writer.write_int32(self.station_id)
+        self.station.write(writer)
+
+    @classmethod
+    def read(cls, reader: BinaryReader) -> Self:
+        """Read a search result from a binary reader."""
+        return cls(
+            air_quality_index=_read_aqi(reader),
+            station_id=reader.read_int32(),
+            station=Station.read(reader),
+        )
+
+
+def _write_aqi(writer: BinaryWriter, aqi: int | None) -> None:
+    """Write a nullable air quality index."""
+    writer.write_uint8(aqi is not None)
+    if aqi is not None:
+        writer.write_int32(aqi)
+
+
+def _read_aqi(reader: BinaryReader) -> int | None:
+    """Read a nullable air quality index."""
+    if not reader.read_uint8():
+        return None
+    return reader.read_int32()
@@ -0,0 +1,211 @@
+"""Asynchronous Python client for the WAQI API."""
+
+# aiohttp and yarl are imported on first use to keep importing aiowaqi light.
+# ruff: noqa: PLC0415
+# pylint: disable=import-outside-toplevel
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterable, Awaitable, Callable, Iterable
+from typing import TYPE_CHECKING, Any
+
+from .const import LOGGER
+from .exceptions import WAQIError
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+    from typing import Self
+
+    from .models import WAQIAirQuality
+    from .waqi import WAQIClient
+
+type StationIdentifier = int | str
+type Sink = Callable[[list[WAQIAirQuality]], Awaitable[None]]
+
+
+async def poll_source(
+    identifiers: Iterable[StationIdentifier],
+    interval: float,
+) -> AsyncIterator[StationIdentifier]:
+    """Yield the identifiers every interval seconds, forever."""
+    identifiers = list(identifiers)
+    while True:
+        for identifier in identifiers:
+            yield identifier
+        await asyncio.sleep(interval)
+
+
+async def _until(future: asyncio.Future[Any], sink_task: asyncio.Task[None]) -> None:
+    """Wait for a future, failing early when the sink fails."""
+    await asyncio.wait((future, sink_task), return_when=asyncio.FIRST_COMPLETED)
+    if not future.done():
+        future.cancel()
+        await sink_task
+    await future
+
+
+class Pipeline:
+    """Stream air quality readings from a source of stations into a sink.
+
+    Station identifiers flow from the source through bounded queues into
+    fetch workers, and the parsed readings are handed to the sink in batches
+    by count or time. The bounded queues apply backpressure, so memory stays
+    flat regardless of the size of the source.
+    """
+
+    def __init__(  # noqa: PLR0913  # pylint: disable=too-many-arguments
+        self,
+        client: WAQIClient,
+        sink: Sink,
+        *,
+        batch_size: int = 100,
+        flush_interval: float = 5.0,
+        max_queue_size: int = 1000,
+        concurrency: int = 4,
+    ) -> None:
+        """Initialize the pipeline."""
+        self.client = client
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.concurrency = concurrency
+        self._identifiers: asyncio.Queue[StationIdentifier] = asyncio.Queue(
+            max_queue_size
+        )
+        self._results: asyncio.Queue[WAQIAirQuality | None] = asyncio.Queue(
+            max_queue_size
+        )
+        self._source_task: asyncio.Task[None] | None = None
+        self._fetch_tasks: list[asyncio.Task[None]] = []
+        self._sink_task: asyncio.Task[None] | None = None
+
+    def start(
+        self,
+        source: AsyncIterable[StationIdentifier] | Iterable[StationIdentifier],
+    ) -> None:
+        """Start consuming the source in the background."""
+        self._start(source)
+
+    def _start(
+        self,
+        source: AsyncIterable[StationIdentifier] | Iterable[StationIdentifier],
+    ) -> tuple[asyncio.Task[None], asyncio.Task[None]]:
+        """Start the stages and return the source and sink tasks."""
+        if self._source_task is not None:
+            msg = "Pipeline has already been started"
+            raise WAQIError(msg)
+        self._source_task = asyncio.create_task(self._produce(source))
+        self._fetch_tasks = [
+            asyncio.create_task(self._fetch()) for _ in range(self.concurrency)
+        ]
+        self._sink_task = asyncio.create_task(self._consume())
+        return self._source_task, self._sink_task
+
+    async def run(
+        self,
+        source: AsyncIterable[StationIdentifier] | Iterable[StationIdentifier],
+    ) -> None:
+        """Consume the source until it is exhausted and flush all readings."""
+        source_task, sink_task = self._start(source)
+        try:
+            await _until(source_task, sink_task)
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        """Stop consuming the source and drain the queued readings into the sink."""
+        if self._source_task is None or self._sink_task is None:
+            return
+        self._source_task.cancel()
+        try:
+            if not self._sink_task.done():
+                await _until(
+                    asyncio.ensure_future(self._identifiers.join()), self._sink_task
+                )
+                await self._results.put(None)
+            await self._sink_task
+        finally:
+            for task in self._fetch_tasks:
+                task.cancel()
+            await asyncio.gather(
+                self._source_task, *self._fetch_tasks, return_exceptions=True
+            )
+            self._source_task = None
+            self._sink_task = None
+
+    async def _produce(
+        self,
+        source: AsyncIterable[StationIdentifier] | Iterable[StationIdentifier],
+    ) -> None:
+        """Put the identifiers of the source on the queue."""
+        if isinstance(source, AsyncIterable):
+            async for identifier in source:
+                await self._identifiers.put(identifier)
+        else:
+            for identifier in source:
+                await self._identifiers.put(identifier)
+
+    async def _fetch(self) -> None:
+        """Fetch the air quality of queued identifiers."""
+        from aiohttp import ClientError
+
+        while True:
+            identifier = await self._identifiers.get()
+            try:
+                if isinstance(identifier, int):
+                    air_quality = await self.client.get_by_station_number(identifier)
+                else:
+                    air_quality = await self.client.get_by_name(identifier)
+                await self._results.put(air_quality)
+            except (WAQIError, ClientError) as exception:
+                LOGGER.warning("Could not fetch %s: %s", identifier, exception)
+            except Exception:  # noqa: BLE001  # pylint: disable=broad-exception-caught
+                # A dead worker would leave its identifiers unfinished forever.
+                LOGGER.exception("Unexpected error fetching %s", identifier)
+            finally:
+                self._identifiers.task_done()
+
+    async def _consume(self) -> None:
+        """Hand readings to the sink in batches by count or time."""
+        loop = asyncio.get_running_loop()
+        batch: list[WAQIAirQuality] = []
+        deadline = 0.0
+        while True:
+            try:
+                async with asyncio.timeout_at(deadline if batch else None):
+                    air_quality = await self._results.get()
+            except TimeoutError:
+                await self.sink(batch)
+                batch = []
+                continue
+            if air_quality is None:
+                if batch:
+                    await self.sink(batch)
+                return
+            if not batch:
+                deadline = loop.time() + self.flush_interval
+            batch.append(air_quality)
+            if len(batch) >= self.batch_size:
+                await self.sink(batch)
+                batch = []
+
+    async def __aenter__(self) -> Self:
+        """Async enter.
+
+        Returns
+        -------
+            The Pipeline object.
+
+        """
+        return self
+
+    async def __aexit__(self, *_exc_info: object) -> None:
+        """Async exit.
+
+        Args:
+        ----
+            _exc_info: Exec type.
+
+        """
+        await self.close()
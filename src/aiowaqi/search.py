@@ -0,0 +1,256 @@
+"""Asynchronous Python client for the WAQI API."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import OrderedDict
+from difflib import SequenceMatcher, get_close_matches
+import re
+import time
+from typing import TYPE_CHECKING
+import unicodedata
+
+from .models import Station, WAQISearchResult
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from .binary import BinaryReader, BinaryWriter
+    from .models import WAQIAirQuality
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+_EXACT_SCORE = 3.0
+_PREFIX_SCORE = 2.0
+
+
+def normalize_keyword(keyword: str) -> str:
+    """Normalize a keyword by case folding, stripping accents and punctuation."""
+    decomposed = unicodedata.normalize("NFKD", keyword.casefold())
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(_TOKEN_PATTERN.findall(stripped))
+
+
+class SearchIndex:
+    """Local index of search results with prefix and fuzzy token matching.
+
+    Results are indexed by the tokens of their station name. Lookups are
+    cached per normalized keyword until the index changes, and results
+    returned by the remote search endpoint are cached for their keyword.
+    As results carry an air quality index, `lookup` only serves results
+    added within the last `ttl` seconds, while `search` matches all indexed
+    stations.
+    """
+
+    def __init__(
+        self,
+        *,
+        fuzzy_cutoff: float = 0.8,
+        cache_size: int = 256,
+        ttl: float = 900.0,
+    ) -> None:
+        """Initialize an empty index.
+
+        Args:
+        ----
+            fuzzy_cutoff: the minimum similarity of fuzzy token matches.
+            cache_size: the maximum amount of keywords to cache lookups for.
+            ttl: the time in seconds a result is served by `lookup`.
+
+        """
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self.cache_size = cache_size
+        self.ttl = ttl
+        self._results: dict[int, WAQISearchResult] = {}
+        self._added_at: dict[int, float] = {}
+        self._tokens: dict[str, set[int]] = {}
+        self._vocabulary: list[str] = []
+        self._remote: OrderedDict[str, tuple[float, list[WAQISearchResult]]] = (
+            OrderedDict()
+        )
+        self._local: OrderedDict[str, list[WAQISearchResult]] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the amount of indexed stations."""
+        return len(self._results)
+
+    def add(
+        self,
+        results: Iterable[WAQISearchResult],
+        *,
+        keyword: str | None = None,
+    ) -> None:
+        """Add search results to the index.
+
+        When a keyword is given, the results are cached as the remote
+        response for that keyword.
+        """
+        results = list(results)
+        added_at = time.monotonic()
+        for result in results:
+            if (previous := self._results.get(result.station_id)) is not None:
+                for token in _tokenize(previous.station.name):
+                    self._tokens[token].discard(result.station_id)
+            self._results[result.station_id] = result
+            self._added_at[result.station_id] = added_at
+            for token in _tokenize(result.station.name):
+                self._tokens.setdefault(token, set()).add(result.station_id)
+        self._vocabulary = sorted(token for token, ids in self._tokens.items() if ids)
+        self._local.clear()
+        if keyword is not None:
+            _store(
+                self._remote,
+                normalize_keyword(keyword),
+                (added_at, results),
+                self.cache_size,
+            )
+
+    def add_air_quality(self, air_qualities: Iterable[WAQIAirQuality]) -> None:
+        """Add the stations of feed results to the index."""
+        self.add(
+            WAQISearchResult(
+                air_quality_index=air_quality.air_quality_index,
+                station_id=air_quality.station_id,
+                station=Station(
+                    external_url=air_quality.city.external_url,
+                    name=air_quality.city.name,
+                    coordinates=air_quality.city.coordinates,
+                ),
+            )
+            for air_quality in air_qualities
+        )
+
+    def lookup(self, keyword: str) -> list[WAQISearchResult] | None:
+        """Return fresh cached or local results for a keyword, or None on a miss.
+
+        Expired results are a miss, so they are fetched again.
+        """
+        normalized = normalize_keyword(keyword)
+        now = time.monotonic()
+        if (entry := self._remote.get(normalized)) is not None:
+            added_at, cached = entry
+            if now - added_at < self.ttl:
+                self._remote.move_to_end(normalized)
+                return list(cached)
+            del self._remote[normalized]
+            return None
+        results = self.search(normalized)
+        if not results or any(
+            now - self._added_at[result.station_id] >= self.ttl for result in results
+        ):
+            return None
+        return results
+
+    def search(self, keyword: str) -> list[WAQISearchResult]:
+        """Search the local index, ranking the best matching stations first."""
+        normalized = normalize_keyword(keyword)
+        if (cached := self._local.get(normalized)) is not None:
+            self._local.move_to_end(normalized)
+            return list(cached)
+        scores: dict[int, float] | None = None
+        for query_token in normalized.split():
+            token_scores: dict[int, float] = {}
+            for token, score in self._match_token(query_token):
+                for station_id in self._tokens[token]:
+                    token_scores[station_id] = max(
+                        score, token_scores.get(station_id, 0.0)
+                    )
+            if scores is None:
+                scores = token_scores
+            else:
+                scores = {
+                    station_id: score + token_scores[station_id]
+                    for station_id, score in scores.items()
+                    if station_id in token_scores
+                }
+            if not scores:
+                break
+        ranking = scores or {}
+        results = sorted(
+            (self._results[station_id] for station_id in ranking),
+            key=lambda result: (
+                -ranking[result.station_id],
+                result.station.name,
+                result.station_id,
+            ),
+        )
+        _store(self._local, normalized, results, self.cache_size)
+        return list(results)
+
+    def _match_token(self, query_token: str) -> list[tuple[str, float]]:
+        """Return the indexed tokens matching a query token with their score."""
+        matches: list[tuple[str, float]] = []
+        index = bisect_left(self._vocabulary, query_token)
+        while index < len(self._vocabulary) and self._vocabulary[index].startswith(
+            query_token
+        ):
+            token = self._vocabulary[index]
+            matches.append(
+                (token, _EXACT_SCORE if token == query_token else _PREFIX_SCORE)
+            )
+            index += 1
+        if matches:
+            return matches
+        return [
+            (token, SequenceMatcher(None, query_token, token).ratio())
+            for token in get_close_matches(
+                query_token, self._vocabulary, n=5, cutoff=self.fuzzy_cutoff
+            )
+        ]
+
+    def write_state(self, writer: BinaryWriter) -> None:
+        """Write the indexed results and cached remote keywords."""
+        offset = time.time() - time.monotonic()
+        writer.write_uint32(len(self._results))
+        for station_id, result in self._results.items():
+            writer.write_float64(self._added_at[station_id] + offset)
+            result.write(writer)
+        writer.write_uint32(len(self._remote))
+        for keyword, (added_at, results) in self._remote.items():
+            writer.write_string(keyword)
+            writer.write_float64(added_at + offset)
+            writer.write_uint32(len(results))
+            for result in results:
+                writer.write_int32(result.station_id)
+
+    def read_state(self, reader: BinaryReader) -> None:
+        """Restore the results and keywords written by `write_state`.
+
+        Results keep the time they were added, and expired keywords are dropped.
+        """
+        offset = time.time() - time.monotonic()
+        added_at: dict[int, float] = {}
+        results: list[WAQISearchResult] = []
+        for _ in range(reader.read_uint32()):
+            timestamp = reader.read_float64() - offset
+            result = WAQISearchResult.read(reader)
+            added_at[result.station_id] = timestamp
+            results.append(result)
+        self.add(results)
+        self._added_at.update(added_at)
+        for _ in range(reader.read_uint32()):
+            keyword = reader.read_required_string()
+            timestamp = reader.read_float64() - offset
+            cached = [
+                self._results[reader.read_int32()] for _ in range(reader.read_uint32())
+            ]
+            if time.monotonic() - timestamp < self.ttl:
+                _store(self._remote, keyword, (timestamp, cached), self.cache_size)
+
+
+def _tokenize(name: str) -> set[str]:
+    """Return the normalized tokens of a station name."""
+    return set(normalize_keyword(name).split())
+
+
+def _store[ValueT](
+    cache: OrderedDict[str, ValueT],
+    key: str,
+    value: ValueT,
+    size: int,
+) -> None:
+    """Store a value in a bounded cache."""
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > size:
+        cache.popitem(last=False)
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import math
 from typing import Any
 
 from .const import LOGGER
@@ -21,3 +22,17 @@ def to_nullable_enum[EnumT](
             str(enum_class),
         )
         return None
+
+
+def to_nullable_int(value: Any) -> int | None:
+    """Convert a value to an int, returning None for non-numeric values."""
+    if isinstance(value, int):
+        return int(value)
+    if isinstance(value, float):
+        return int(value) if math.isfinite(value) else None
+    if isinstance(value, str):
+        stripped = value.strip()
+        digits = stripped[1:] if stripped[:1] in {"-", "+"} else stripped
+        if digits.isdecimal():
+            return int(stripped)
+    return None
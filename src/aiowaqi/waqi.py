@@ -1,29 +1,65 @@
 """Asynchronous Python client for the WAQI API."""
 
+# aiohttp and yarl are imported on first use to keep importing aiowaqi light.
+# ruff: noqa: PLC0415
+# pylint: disable=import-outside-toplevel
+
 from __future__ import annotations
 
 import asyncio
-from dataclasses import dataclass
-from importlib import metadata
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from functools import cache
+import json
+from pathlib import Path
+import struct
+import time
 from typing import TYPE_CHECKING, Any, cast
 
-from aiohttp import ClientSession
-from aiohttp.hdrs import METH_GET
-from yarl import URL
-
+from .binary import FORMAT_VERSION, BinaryReader, BinaryWriter
+from .const import LOGGER
 from .exceptions import (
     WAQIAuthenticationError,
+    WAQICircuitOpenError,
     WAQIConnectionError,
     WAQIError,
+    WAQISerializationError,
     WAQIUnknownCityError,
     WAQIUnknownStationError,
 )
 from .models import WAQIAirQuality, WAQISearchResult
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+    from os import PathLike
     from typing import Self
 
-VERSION = metadata.version(__package__)
+    from aiohttp import ClientSession
+    from yarl import URL
+
+    from .circuit_breaker import CircuitBreaker
+    from .geo_cache import GeoCache
+    from .search import SearchIndex
+
+HEDGE_MIN_SAMPLES = 20
+HEDGE_PERCENTILE = 0.95
+OPTIONAL_SECTIONS = frozenset({"forecast", "debug"})
+
+
+@cache
+def get_version() -> str:
+    """Return the installed version of the package."""
+    from importlib import metadata
+
+    return metadata.version(__package__)
+
+
+def __getattr__(name: str) -> Any:
+    """Look up the version lazily to keep the import light."""
+    if name == "VERSION":
+        return get_version()
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
 
 
 @dataclass
@@ -33,8 +69,43 @@ class WAQIClient:
     session: ClientSession | None = None
     request_timeout: int = 10
     api_host: str = "api.waqi.info"
+    search_index: SearchIndex | None = None
+    geo_cache: GeoCache | None = None
+    hedge_requests: bool = False
+    stale_while_revalidate: bool = False
+    circuit_breaker_factory: Callable[[], CircuitBreaker] | None = None
+    skip_sections: frozenset[str] = frozenset()
+    stale_cache_size: int = 1000
+    stale_max_age: float = 3600.0
     _token: str | None = None
     _close_session: bool = False
+    _latencies: deque[float] = field(
+        default_factory=lambda: deque(maxlen=100), init=False, repr=False
+    )
+    _stale: OrderedDict[str, tuple[float, dict[str, Any]]] = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+    _revalidating: dict[str, asyncio.Task[None]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _circuit_breakers: dict[str, CircuitBreaker] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        """Reject skipping sections that readings cannot be parsed without."""
+        self.skip_sections = frozenset(self.skip_sections)
+        if unknown := self.skip_sections - OPTIONAL_SECTIONS:
+            msg = (
+                f"Cannot skip sections {', '.join(sorted(unknown))}, only "
+                f"{', '.join(sorted(OPTIONAL_SECTIONS))} are optional"
+            )
+            raise WAQIError(msg)
+
+    @property
+    def circuit_breakers(self) -> dict[str, CircuitBreaker]:
+        """Return the circuit breakers per route."""
+        return dict(self._circuit_breakers)
 
     def authenticate(self, token: str) -> None:
         """Authenticate the user with a token."""
@@ -45,6 +116,7 @@ class WAQIClient:
         uri: str,
         *,
         data: dict[str, Any] | None = None,
+        deadline: float | None = None,
     ) -> dict[str, Any]:
         """Handle a request to WAQI.
 
@@ -55,6 +127,8 @@ class WAQIClient:
         ----
             uri: the path to call.
             data: the query parameters to add.
+            deadline: the time in seconds the request may take, defaults to the
+                request timeout.
 
         Returns:
         -------
@@ -65,38 +139,128 @@ class WAQIClient:
         ------
             WAQIConnectionError: An error occurred while communicating with
                 the WAQI API.
+            WAQICircuitOpenError: The circuit breaker for the route is open
+                and no earlier response is available.
             WAQIError: Received an unexpected response from the WAQI API.
             WAQIAuthenticationError: Used token is invalid.
 
         """
+        from yarl import URL
+
         url = URL.build(
             scheme="https",
             host=self.api_host,
             port=443,
         ).joinpath(uri)
 
+        if data is None:  # pragma: no cover
+            data = {}
+        key = str(url.with_query(data))
+        data["token"] = self._token
+        url = url.with_query(data)
+        route = f"{uri.split('/', 1)[0]}/"
+
+        if self.stale_while_revalidate and (stale := self._get_stale(key)) is not None:
+            self._revalidate(key, url, route)
+            return stale
+
+        try:
+            response_data = await self._guarded_request(url, deadline, route)
+        except WAQICircuitOpenError:
+            if (stale := self._get_stale(key)) is not None:
+                return stale
+            raise
+        if (
+            self.stale_while_revalidate or self.circuit_breaker_factory is not None
+        ) and response_data["status"] == "ok":
+            self._set_stale(key, response_data)
+        return response_data
+
+    def _get_stale(self, key: str) -> dict[str, Any] | None:
+        """Return the last response of a request unless it is too old to serve."""
+        if (entry := self._stale.get(key)) is None:
+            return None
+        fetched_at, response_data = entry
+        if time.monotonic() - fetched_at >= self.stale_max_age:
+            del self._stale[key]
+            return None
+        self._stale.move_to_end(key)
+        return response_data
+
+    def _set_stale(self, key: str, response_data: dict[str, Any]) -> None:
+        """Keep a response, evicting the least recently used ones."""
+        self._stale[key] = (time.monotonic(), response_data)
+        self._stale.move_to_end(key)
+        while len(self._stale) > self.stale_cache_size:
+            self._stale.popitem(last=False)
+
+    async def _guarded_request(
+        self,
+        url: URL,
+        deadline: float | None,
+        route: str,
+    ) -> dict[str, Any]:
+        """Send a request through the circuit breaker of its route."""
+        if self.circuit_breaker_factory is None:
+            return await self._request_with_deadline(url, deadline)
+        if (breaker := self._circuit_breakers.get(route)) is None:
+            breaker = self._circuit_breakers[route] = self.circuit_breaker_factory()
+        if not breaker.allow_request():
+            msg = f"Circuit breaker is open for {route}"
+            raise WAQICircuitOpenError(msg)
+        started = time.monotonic()
+        try:
+            response_data = await self._request_with_deadline(url, deadline)
+        except WAQIAuthenticationError:
+            breaker.record_success(time.monotonic() - started)
+            raise
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+        except BaseException:
+            # Any other exit counts as a failure, so a probe never stays reserved.
+            breaker.record_failure()
+            raise
+        breaker.record_success(time.monotonic() - started)
+        return response_data
+
+    async def _request_with_deadline(
+        self,
+        url: URL,
+        deadline: float | None,
+    ) -> dict[str, Any]:
+        """Send a request, hedging it when enabled, within a deadline."""
+        try:
+            async with asyncio.timeout(
+                self.request_timeout if deadline is None else deadline
+            ):
+                if self.hedge_requests and (delay := self._hedge_delay()) is not None:
+                    return await self._hedged_request(url, delay)
+                return await self._send(url)
+        except TimeoutError as exception:
+            msg = "Timeout occurred while connecting to the WAQI API"
+            raise WAQIConnectionError(msg) from exception
+
+    async def _send(self, url: URL) -> dict[str, Any]:
+        """Send a single request to WAQI and decode the response."""
         headers = {
-            "User-Agent": f"WAQIAsync/{VERSION}",
+            "User-Agent": f"WAQIAsync/{get_version()}",
             "Accept": "application/json, text/plain, */*",
         }
 
+        from aiohttp import ClientSession
+        from aiohttp.hdrs import METH_GET
+
         if self.session is None:
             self.session = ClientSession()
             self._close_session = True
 
-        if data is None:  # pragma: no cover
-            data = {}
-        data["token"] = self._token
-        try:
-            async with asyncio.timeout(self.request_timeout):
-                response = await self.session.request(
-                    METH_GET,
-                    url.with_query(data),
-                    headers=headers,
-                )
-        except TimeoutError as exception:
-            msg = "Timeout occurred while connecting to the WAQI API"
-            raise WAQIConnectionError(msg) from exception
+        started = time.monotonic()
+        response = await self.session.request(
+            METH_GET,
+            url,
+            headers=headers,
+        )
 
         content_type = response.headers.get("Content-Type", "")
 
@@ -109,24 +273,92 @@ class WAQIClient:
             )
 
         response_data = cast("dict[str, Any]", await response.json())
+        self._latencies.append(time.monotonic() - started)
         if (
             response_data["status"] == "error"
             and response_data["data"] == "Invalid key"
         ):
             raise WAQIAuthenticationError
+        if self.skip_sections and isinstance(data := response_data["data"], dict):
+            for section in self.skip_sections:
+                data.pop(section, None)
         return response_data
 
-    async def get_by_city(self, city: str) -> WAQIAirQuality:
+    def _hedge_delay(self) -> float | None:
+        """Return the p95 latency to wait for before hedging a request."""
+        if len(self._latencies) < HEDGE_MIN_SAMPLES:
+            return None
+        latencies = sorted(self._latencies)
+        return latencies[int(HEDGE_PERCENTILE * (len(latencies) - 1))]
+
+    async def _hedged_request(self, url: URL, delay: float) -> dict[str, Any]:
+        """Send a request and a duplicate after a delay, returning the first."""
+        tasks = {asyncio.ensure_future(self._send(url))}
+        try:
+            done, pending = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                tasks.add(asyncio.ensure_future(self._send(url)))
+            pending = set(tasks)
+            while True:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                # Retrieve every exception, as a failure finishing alongside
+                # a success would otherwise be logged as never retrieved.
+                succeeded = [task for task in done if task.exception() is None]
+                if succeeded:
+                    return succeeded[0].result()
+                if not pending:
+                    return done.pop().result()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _revalidate(self, key: str, url: URL, route: str) -> None:
+        """Refresh a stale response in the background."""
+        if key in self._revalidating:
+            return
+        task = asyncio.create_task(self._refresh(key, url, route))
+        self._revalidating[key] = task
+        task.add_done_callback(lambda _: self._revalidating.pop(key, None))
+
+    async def _refresh(self, key: str, url: URL, route: str) -> None:
+        """Replace a stale response with a fresh one."""
+        from aiohttp import ClientError
+
+        try:
+            response_data = await self._guarded_request(url, None, route)
+        except (WAQIError, ClientError) as exception:
+            LOGGER.debug("Could not refresh %s: %s", key, exception)
+            return
+        except Exception:  # noqa: BLE001  # pylint: disable=broad-exception-caught
+            # Nothing awaits the task, so the error would otherwise go unseen.
+            LOGGER.exception("Unexpected error refreshing %s", key)
+            return
+        if response_data["status"] == "ok":
+            self._set_stale(key, response_data)
+
+    async def get_by_city(
+        self,
+        city: str,
+        *,
+        deadline: float | None = None,
+    ) -> WAQIAirQuality:
         """Get air quality information for a given city."""
-        response = await self._request(f"feed/{city}")
+        response = await self._request(f"feed/{city}", deadline=deadline)
         if response["status"] == "error" and response["data"] == "Unknown station":
             msg = f"Could not find city {city}"
             raise WAQIUnknownCityError(msg)
         return WAQIAirQuality.from_dict(response["data"])
 
-    async def get_by_name(self, name: str) -> WAQIAirQuality:
+    async def get_by_name(
+        self,
+        name: str,
+        *,
+        deadline: float | None = None,
+    ) -> WAQIAirQuality:
         """Get air quality measuring station by name."""
-        response = await self._request(f"feed/{name}")
+        response = await self._request(f"feed/{name}", deadline=deadline)
         data = response["data"]
         if (
             response["status"] == "error"
@@ -140,32 +372,250 @@ class WAQIClient:
             raise WAQIUnknownStationError(msg)
         return WAQIAirQuality.from_dict(data)
 
-    async def get_by_station_number(self, station_number: int) -> WAQIAirQuality:
+    async def get_by_station_number(
+        self,
+        station_number: int,
+        *,
+        deadline: float | None = None,
+    ) -> WAQIAirQuality:
         """Get air quality measuring station by station number."""
-        return await self.get_by_name(f"@{station_number}")
+        return await self.get_by_name(f"@{station_number}", deadline=deadline)
 
     async def get_by_coordinates(
         self,
         latitude: float,
         longitude: float,
+        *,
+        deadline: float | None = None,
     ) -> WAQIAirQuality:
-        """Get nearest air quality measuring station by coordinates."""
-        response = await self._request(f"feed/geo:{latitude};{longitude}")
-        return WAQIAirQuality.from_dict(response["data"])
+        """Get nearest air quality measuring station by coordinates.
+
+        When a geo cache is set, nearby coordinates share a cached reading and
+        known cells are refreshed by station number. A cell whose station no
+        longer exists is resolved by coordinates again, within what is left
+        of the deadline.
+        """
+        if (
+            self.geo_cache is not None
+            and (station_id := self.geo_cache.get_station(latitude, longitude))
+            is not None
+        ):
+            if (air_quality := self.geo_cache.get_reading(station_id)) is not None:
+                return air_quality
+            started = time.monotonic()
+            try:
+                air_quality = await self.get_by_station_number(
+                    station_id, deadline=deadline
+                )
+            except WAQIUnknownStationError:
+                self.geo_cache.discard(latitude, longitude)
+                deadline = max(
+                    (self.request_timeout if deadline is None else deadline)
+                    - (time.monotonic() - started),
+                    0,
+                )
+            else:
+                self.geo_cache.add_reading(air_quality)
+                return air_quality
+        response = await self._request(
+            f"feed/geo:{latitude};{longitude}", deadline=deadline
+        )
+        air_quality = WAQIAirQuality.from_dict(response["data"])
+        if self.geo_cache is not None:
+            self.geo_cache.add(latitude, longitude, air_quality)
+        return air_quality
 
     async def get_by_ip(
         self,
+        *,
+        deadline: float | None = None,
     ) -> WAQIAirQuality:
         """Get the nearest air quality measuring station according to WAQI."""
-        return await self.get_by_name("here")
+        return await self.get_by_name("here", deadline=deadline)
+
+    async def search(
+        self,
+        keyword: str,
+        *,
+        deadline: float | None = None,
+    ) -> list[WAQISearchResult]:
+        """Search for stations with a keyword.
+
+        When a search index is set, it is consulted first and the API is only
+        called when it has no results for the keyword.
+        """
+        if (
+            self.search_index is not None
+            and (results := self.search_index.lookup(keyword)) is not None
+        ):
+            return results
+        response = await self._request(
+            "search/", data={"keyword": keyword}, deadline=deadline
+        )
+        results = [WAQISearchResult.from_dict(station) for station in response["data"]]
+        if self.search_index is not None:
+            self.search_index.add(results, keyword=keyword)
+        return results
+
+    def save_state(self, path: str | PathLike[str]) -> None:
+        """Save the learned state of the client to a file.
+
+        The state holds the request latencies, the cached responses, the
+        circuit breakers, the geo cache and the search index. The file is
+        written next to the target and moved into place, so a crash never
+        leaves a truncated state behind. This blocks on file I/O.
 
-    async def search(self, keyword: str) -> list[WAQISearchResult]:
-        """Search for stations with a keyword."""
-        response = await self._request("search/", data={"keyword": keyword})
-        return [WAQISearchResult.from_dict(station) for station in response["data"]]
+        Args:
+        ----
+            path: the file to write the state to.
+
+        """
+        writer = BinaryWriter()
+        writer.write_uint8(FORMAT_VERSION)
+        writer.write_uint16(len(self._latencies))
+        for latency in self._latencies:
+            writer.write_float64(latency)
+        offset = time.time() - time.monotonic()
+        writer.write_uint32(len(self._stale))
+        for key, (fetched_at, response) in self._stale.items():
+            writer.write_string(key)
+            writer.write_float64(fetched_at + offset)
+            writer.write_bytes(json.dumps(response, separators=(",", ":")).encode())
+        writer.write_uint16(len(self._circuit_breakers))
+        for route, breaker in self._circuit_breakers.items():
+            writer.write_string(route)
+            breaker.write_state(writer)
+        writer.write_uint8(self.geo_cache is not None)
+        if self.geo_cache is not None:
+            self.geo_cache.write_state(writer)
+        writer.write_uint8(self.search_index is not None)
+        if self.search_index is not None:
+            self.search_index.write_state(writer)
+        path = Path(path)
+        temporary = path.with_name(f"{path.name}.tmp")
+        temporary.write_bytes(writer.getvalue())
+        temporary.replace(path)
+
+    def _read_stale(
+        self, reader: BinaryReader
+    ) -> OrderedDict[str, tuple[float, dict[str, Any]]]:
+        """Read the cached responses that are not too old to serve."""
+        offset = time.time() - time.monotonic()
+        stale: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        for _ in range(reader.read_uint32()):
+            key = reader.read_required_string()
+            fetched_at = reader.read_float64() - offset
+            response_data = json.loads(reader.read_bytes())
+            if time.monotonic() - fetched_at < self.stale_max_age:
+                stale[key] = (fetched_at, response_data)
+                stale.move_to_end(key)
+        while len(stale) > self.stale_cache_size:
+            stale.popitem(last=False)
+        return stale
+
+    def _read_circuit_breakers(self, reader: BinaryReader) -> dict[str, CircuitBreaker]:
+        """Read the circuit breakers per route."""
+        from .circuit_breaker import CircuitBreaker
+
+        circuit_breakers: dict[str, CircuitBreaker] = {}
+        for _ in range(reader.read_uint16()):
+            route = reader.read_required_string()
+            breaker = circuit_breakers[route] = (
+                self.circuit_breaker_factory()
+                if self.circuit_breaker_factory is not None
+                else CircuitBreaker()
+            )
+            breaker.read_state(reader)
+        return circuit_breakers
+
+    def _read_geo_cache(self, reader: BinaryReader) -> GeoCache:
+        """Read a geo cache with the settings of the current one."""
+        from .geo_cache import GeoCache
+
+        geo_cache = (
+            GeoCache(
+                resolution=self.geo_cache.resolution,
+                max_cells=self.geo_cache.max_cells,
+                ttl=self.geo_cache.ttl,
+            )
+            if self.geo_cache is not None
+            else GeoCache()
+        )
+        geo_cache.read_state(reader)
+        return geo_cache
+
+    def _read_search_index(self, reader: BinaryReader) -> SearchIndex:
+        """Read a search index with the settings of the current one."""
+        from .search import SearchIndex
+
+        search_index = (
+            SearchIndex(
+                fuzzy_cutoff=self.search_index.fuzzy_cutoff,
+                cache_size=self.search_index.cache_size,
+                ttl=self.search_index.ttl,
+            )
+            if self.search_index is not None
+            else SearchIndex()
+        )
+        search_index.read_state(reader)
+        return search_index
+
+    def load_state(self, path: str | PathLike[str]) -> None:
+        """Restore the state saved by `save_state`.
+
+        Parts of the state are only restored into the features the client
+        has enabled, and readings that expired in the meantime are dropped.
+        The whole file is read before the restored parts replace the current
+        ones, so an invalid file leaves the client untouched. The geo cache
+        and search index are replaced by restored instances with the same
+        settings. This blocks on file I/O.
+
+        Args:
+        ----
+            path: the file to read the state from.
+
+        Raises:
+        ------
+            WAQISerializationError: if the file does not hold a valid state.
+
+        """
+        reader = BinaryReader(Path(path).read_bytes())
+        try:
+            reader.read_version()
+            latencies = [reader.read_float64() for _ in range(reader.read_uint16())]
+            stale = self._read_stale(reader)
+            circuit_breakers = self._read_circuit_breakers(reader)
+            geo_cache = self._read_geo_cache(reader) if reader.read_uint8() else None
+            search_index = (
+                self._read_search_index(reader) if reader.read_uint8() else None
+            )
+        except (
+            struct.error,
+            UnicodeDecodeError,
+            ValueError,
+            KeyError,
+            OverflowError,
+        ) as exception:
+            msg = "Could not load the client state"
+            raise WAQISerializationError(msg) from exception
+        reader.ensure_consumed()
+
+        self._latencies.clear()
+        self._latencies.extend(latencies)
+        self._stale = stale
+        if self.circuit_breaker_factory is not None:
+            self._circuit_breakers = circuit_breakers
+        if self.geo_cache is not None and geo_cache is not None:
+            self.geo_cache = geo_cache
+        if self.search_index is not None and search_index is not None:
+            self.search_index = search_index
 
     async def close(self) -> None:
         """Close open client session."""
+        tasks = list(self._revalidating.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
         if self.session and self._close_session:
             await self.session.close()
 
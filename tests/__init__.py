@@ -1,9 +1,17 @@
 """Tests for the WAQI Library."""
 
+import json
 from pathlib import Path
 
+from aiowaqi import WAQIAirQuality
+
 
 def load_fixture(filename: str) -> str:
     """Load a fixture."""
     path = Path(__package__) / "fixtures" / filename
     return path.read_text(encoding="utf-8")
+
+
+def load_air_quality(filename: str) -> WAQIAirQuality:
+    """Load an air quality fixture."""
+    return WAQIAirQuality.from_dict(json.loads(load_fixture(filename))["data"])
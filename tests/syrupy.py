@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
-from dataclasses import asdict, is_dataclass
+from dataclasses import fields, is_dataclass
 from typing import TYPE_CHECKING, Any
 
 from syrupy.extensions import AmberSnapshotExtension
 from syrupy.extensions.amber import AmberDataSerializer
 
+from aiowaqi import DailyForecasts, WAQIExtendedAirQuality
+
 if TYPE_CHECKING:
     from syrupy.types import (
         PropertyFilter,
@@ -17,6 +19,24 @@ if TYPE_CHECKING:
     )
 
 
+EXTENDED_AIR_QUALITY_ATTRIBUTES = (
+    "carbon_monoxide",
+    "dew_point",
+    "humidity",
+    "nephelometry",
+    "nitrogen_dioxide",
+    "ozone",
+    "pm10",
+    "pm25",
+    "pressure",
+    "sulfur_dioxide",
+    "temperature",
+    "uv_index",
+    "wind",
+    "wind_gust",
+)
+
+
 class WAQISnapshotSerializer(AmberDataSerializer):
     """WAQI snapshot serializer for Syrupy.
 
@@ -40,8 +60,16 @@ class WAQISnapshotSerializer(AmberDataSerializer):
         This allows us to handle specific cases for WAQI data structures.
         """
         serializable_data = data
-        if is_dataclass(type(data)):
-            serializable_data = asdict(data)
+        if isinstance(data, WAQIExtendedAirQuality):
+            serializable_data = {
+                name: getattr(data, name) for name in EXTENDED_AIR_QUALITY_ATTRIBUTES
+            } | {"unknown": data.unknown}
+        elif isinstance(data, DailyForecasts):
+            serializable_data = dict(data)
+        elif is_dataclass(data) and not isinstance(data, type):
+            serializable_data = {
+                field.name: getattr(data, field.name) for field in fields(data)
+            }
 
         return super()._serialize(
             serializable_data,
@@ -57,7 +85,7 @@ class WAQISnapshotSerializer(AmberDataSerializer):
 class WAQISnapshotExtension(AmberSnapshotExtension):
     """WAQI extension for Syrupy."""
 
-    VERSION = "1"
+    VERSION = "2"
     """Current version of serialization format.
 
     Need to be bumped when we change the WAQISnapshotSerializer.
@@ -0,0 +1,114 @@
+"""Tests for the regional aggregation."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+
+from aiowaqi import AirQualityStatistics, BoundingBox, RegionAggregator, WAQIAirQuality
+from aiowaqi.aggregation import by_bounding_box
+from aiowaqi.models import Pollutant
+
+from . import load_air_quality
+
+
+def _air_quality(
+    station_id: int,
+    aqi: int | None,
+    location: str | None = "Utrecht",
+    pollutant: Pollutant | None = Pollutant.PM25,
+) -> WAQIAirQuality:
+    """Return a reading with the given values."""
+    air_quality = load_air_quality("city_feed_utrecht.json")
+    return replace(
+        air_quality,
+        station_id=station_id,
+        air_quality_index=aqi,
+        city=replace(air_quality.city, location=location),
+        dominant_pollutant=pollutant,
+    )
+
+
+def _by_location(air_quality: WAQIAirQuality) -> str | None:
+    """Group readings by the location of their city."""
+    return air_quality.city.location
+
+
+def test_statistics() -> None:
+    """Test computing statistics per location."""
+    aggregator = RegionAggregator(_by_location)
+    aggregator.add(
+        [
+            _air_quality(1, 10),
+            _air_quality(2, 20, pollutant=Pollutant.OZONE),
+            _air_quality(3, 30),
+            _air_quality(4, 40),
+            _air_quality(5, None, pollutant=None),
+            _air_quality(6, 80, location="Amsterdam"),
+            _air_quality(7, 90, location=None),
+        ]
+    )
+    assert aggregator.get("Utrecht") == AirQualityStatistics(
+        stations=5,
+        mean=25,
+        percentiles={50: 25, 90: 37, 95: 38.5},
+        worst_station_id=4,
+        worst_air_quality_index=40,
+        dominant_pollutants={Pollutant.PM25: 3, Pollutant.OZONE: 1},
+    )
+    assert set(aggregator.statistics()) == {"Utrecht", "Amsterdam"}
+    assert aggregator.get("Rotterdam") is None
+
+
+def test_incremental_updates() -> None:
+    """Test replacing and removing readings updates the statistics."""
+    aggregator = RegionAggregator(_by_location, percentiles=(0, 100))
+    aggregator.add([_air_quality(1, 10), _air_quality(2, 20)])
+    aggregator.add([_air_quality(2, 50, pollutant=Pollutant.OZONE)])
+    statistics = aggregator.get("Utrecht")
+    assert statistics is not None
+    assert statistics.mean == 30
+    assert statistics.percentiles == {0: 10, 100: 50}
+    assert statistics.dominant_pollutants == {
+        Pollutant.PM25: 1,
+        Pollutant.OZONE: 1,
+    }
+    aggregator.add([_air_quality(1, 10, location="Amsterdam")])
+    aggregator.add([_air_quality(4, None, pollutant=None)])
+    aggregator.remove(4)
+    aggregator.remove(2)
+    aggregator.remove(3)
+    assert aggregator.get("Utrecht") is None
+    assert set(aggregator.statistics()) == {"Amsterdam"}
+
+
+def test_group_without_index() -> None:
+    """Test a group of stations without an air quality index."""
+    aggregator = RegionAggregator(_by_location)
+    aggregator.add([_air_quality(1, None, pollutant=None)])
+    assert aggregator.get("Utrecht") == AirQualityStatistics(
+        stations=1,
+        mean=None,
+        percentiles={},
+        worst_station_id=None,
+        worst_air_quality_index=None,
+        dominant_pollutants={},
+    )
+
+
+def test_bounding_boxes() -> None:
+    """Test grouping by bounding box."""
+    aggregator = RegionAggregator(
+        by_bounding_box(
+            {
+                "Amsterdam": BoundingBox(52.2, 4.7, 52.5, 5.1),
+                "Utrecht": BoundingBox(52.0, 5.0, 52.2, 5.2),
+            }
+        )
+    )
+    aggregator.add([_air_quality(1, 10)])
+    utrecht = _air_quality(2, 30)
+    utrecht.city.coordinates.latitude = 10
+    aggregator.add([utrecht])
+    statistics = aggregator.statistics()
+    assert set(statistics) == {"Utrecht"}
+    assert statistics["Utrecht"].stations == 1
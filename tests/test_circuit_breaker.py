@@ -0,0 +1,196 @@
+"""Tests for the circuit breaker."""
+
+from __future__ import annotations
+
+import asyncio
+
+from aresponses import ResponsesMockServer
+import pytest
+
+from aiowaqi import (
+    CircuitBreaker,
+    CircuitState,
+    WAQIAuthenticationError,
+    WAQICircuitOpenError,
+    WAQIClient,
+    WAQIConnectionError,
+    WAQIError,
+)
+
+from . import load_fixture
+
+WAQI_URL = "api.waqi.info"
+
+
+def test_opens_on_failure_rate() -> None:
+    """Test the breaker opens when the failure rate reaches the threshold."""
+    breaker = CircuitBreaker(minimum_calls=4, reset_timeout=60)
+    assert breaker.failure_rate == 0
+    for _ in range(2):
+        breaker.record_success(0.1)
+        assert breaker.allow_request()
+        breaker.record_failure()
+    assert breaker.failure_rate == 0.5
+    assert breaker.state is CircuitState.OPEN
+    assert not breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state is CircuitState.OPEN
+
+
+def test_minimum_calls() -> None:
+    """Test the breaker stays closed below the minimum amount of calls."""
+    breaker = CircuitBreaker(minimum_calls=4)
+    for _ in range(3):
+        breaker.record_failure()
+    assert breaker.state is CircuitState.CLOSED
+
+
+def test_slow_calls() -> None:
+    """Test slow calls count as failures."""
+    breaker = CircuitBreaker(minimum_calls=2, slow_call_duration=1)
+    breaker.record_success(0.5)
+    breaker.record_success(2)
+    assert breaker.state is CircuitState.OPEN
+
+
+def test_half_open() -> None:
+    """Test probing a route after the reset timeout."""
+    breaker = CircuitBreaker(minimum_calls=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.state is CircuitState.OPEN
+    assert breaker.allow_request()
+    assert breaker.state is CircuitState.HALF_OPEN
+    assert not breaker.allow_request()
+    breaker.release()
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state is CircuitState.OPEN
+    assert breaker.allow_request()
+    breaker.record_success(0.1)
+    assert breaker.state is CircuitState.CLOSED
+    assert breaker.failure_rate == 0
+    breaker.release()
+    assert breaker.allow_request()
+
+
+def _add_failure(aresponses: ResponsesMockServer, path: str) -> None:
+    """Add a failing response."""
+    aresponses.add(
+        WAQI_URL,
+        path,
+        "GET",
+        aresponses.Response(text="Yes", headers={"Content-Type": "text/plain"}),
+    )
+
+
+def _add_fixture(aresponses: ResponsesMockServer, path: str, fixture: str) -> None:
+    """Add a JSON fixture response."""
+    aresponses.add(
+        WAQI_URL,
+        path,
+        "GET",
+        aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=load_fixture(fixture),
+        ),
+    )
+
+
+async def test_client_fails_fast(
+    aresponses: ResponsesMockServer,
+    authenticated_client: WAQIClient,
+) -> None:
+    """Test the client fails fast per route while the breaker is open."""
+    authenticated_client.circuit_breaker_factory = lambda: CircuitBreaker(
+        minimum_calls=2, reset_timeout=60
+    )
+    for _ in range(2):
+        _add_failure(aresponses, "/feed/utrecht")
+        with pytest.raises(WAQIError):
+            await authenticated_client.get_by_city("utrecht")
+    with pytest.raises(WAQIConnectionError):
+        await authenticated_client.get_by_city("utrecht")
+    _add_fixture(aresponses, "/search/", "search_klundert.json")
+    assert await authenticated_client.search("klundert")
+    assert {
+        route: breaker.state
+        for route, breaker in authenticated_client.circuit_breakers.items()
+    } == {"feed/": CircuitState.OPEN, "search/": CircuitState.CLOSED}
+    aresponses.assert_plan_strictly_followed()
+
+
+async def test_client_serves_cached_data(
+    aresponses: ResponsesMockServer,
+    authenticated_client: WAQIClient,
+) -> None:
+    """Test the last response is served while the breaker is open."""
+    authenticated_client.circuit_breaker_factory = lambda: CircuitBreaker(
+        minimum_calls=1, reset_timeout=60
+    )
+    _add_fixture(aresponses, "/feed/utrecht", "city_feed_utrecht.json")
+    _add_failure(aresponses, "/feed/maarssen")
+    assert (await authenticated_client.get_by_city("utrecht")).station_id == 6332
+    with pytest.raises(WAQIError):
+        await authenticated_client.get_by_city("maarssen")
+    assert (await authenticated_client.get_by_city("utrecht")).station_id == 6332
+    with pytest.raises(WAQICircuitOpenError):
+        await authenticated_client.get_by_city("maarssen")
+
+
+async def test_client_authentication_error(
+    aresponses: ResponsesMockServer,
+    authenticated_client: WAQIClient,
+) -> None:
+    """Test authentication errors do not open the breaker."""
+    authenticated_client.circuit_breaker_factory = lambda: CircuitBreaker(
+        minimum_calls=1
+    )
+    _add_fixture(aresponses, "/feed/utrecht", "unauthenticated.json")
+    with pytest.raises(WAQIAuthenticationError):
+        await authenticated_client.get_by_city("utrecht")
+    assert authenticated_client.circuit_breakers["feed/"].state is (CircuitState.CLOSED)
+
+
+async def test_client_cancelled_probe(
+    aresponses: ResponsesMockServer,
+    authenticated_client: WAQIClient,
+) -> None:
+    """Test a cancelled probe releases its reservation."""
+    breaker = CircuitBreaker(minimum_calls=1, reset_timeout=0)
+    breaker.record_failure()
+    authenticated_client.circuit_breaker_factory = lambda: breaker
+
+    async def response_handler(_: object) -> None:
+        """Response handler for this test."""
+        await asyncio.sleep(5)
+
+    aresponses.add(WAQI_URL, "/feed/utrecht", "GET", response_handler)
+    task = asyncio.create_task(authenticated_client.get_by_city("utrecht"))
+    await asyncio.sleep(0.1)
+    assert breaker.state is CircuitState.HALF_OPEN
+    assert not breaker.allow_request()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert breaker.allow_request()
+
+
+async def test_client_unexpected_probe_error(
+    aresponses: ResponsesMockServer,
+    authenticated_client: WAQIClient,
+) -> None:
+    """Test a probe failing unexpectedly reopens the breaker."""
+    breaker = CircuitBreaker(minimum_calls=1, reset_timeout=0)
+    breaker.record_failure()
+    authenticated_client.circuit_breaker_factory = lambda: breaker
+    aresponses.add(
+        WAQI_URL,
+        "/feed/utrecht",
+        "GET",
+        aresponses.Response(text="{}", headers={"Content-Type": "application/json"}),
+    )
+    with pytest.raises(KeyError):
+        await authenticated_client.get_by_city("utrecht")
+    assert breaker.state is CircuitState.OPEN
+    assert breaker.allow_request()
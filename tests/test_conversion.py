@@ -0,0 +1,143 @@
+"""Tests for the conversion of WAQI sub-indices to other scales."""
+
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+
+from aiowaqi import (
+    AirQualityScale,
+    ConvertedAirQuality,
+    DailyForecast,
+    WAQIExtendedAirQuality,
+)
+from aiowaqi.conversion import (
+    concentration,
+    convert,
+    convert_batch,
+    convert_forecast,
+    convert_index,
+)
+from aiowaqi.models import Pollutant
+
+from . import load_air_quality
+
+FEED_FIXTURES = [
+    "city_feed_utrecht.json",
+    "city_feed_olivias.json",
+    "here.json",
+    "station_number_feed_10142.json",
+    "station_number_feed_372382.json",
+]
+
+
+@pytest.mark.parametrize(
+    ("pollutant", "value", "expected"),
+    [
+        (Pollutant.PM25, 0, 0),
+        (Pollutant.PM25, 50, 12.0),
+        (Pollutant.PM25, 51, 12.1),
+        (Pollutant.PM25, 100, 35.4),
+        (Pollutant.PM25, 500, 500.4),
+        (Pollutant.PM25, 600, 500.4),
+        (Pollutant.PM10, 75.5, 104.5),
+        (Pollutant.OZONE, 100, 70),
+        (Pollutant.CARBON_MONOXIDE, 50, 4.4),
+        (Pollutant.NEPHELOMETRY, 10, None),
+    ],
+)
+def test_concentration(
+    pollutant: Pollutant, value: float, expected: float | None
+) -> None:
+    """Test recovering concentrations from sub-indices."""
+    assert concentration(pollutant, value) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize(
+    ("pollutant", "value", "scale", "expected"),
+    [
+        (Pollutant.PM25, 0, AirQualityScale.US_EPA, 0),
+        (Pollutant.PM25, 50, AirQualityScale.US_EPA, 56),
+        (Pollutant.PM25, 150, AirQualityScale.US_EPA, 150),
+        (Pollutant.PM25, 200, AirQualityScale.US_EPA, 226),
+        (Pollutant.PM25, 400, AirQualityScale.US_EPA, 500),
+        (Pollutant.PM10, 350, AirQualityScale.US_EPA, 344),
+        (Pollutant.OZONE, 42, AirQualityScale.US_EPA, 42),
+        (Pollutant.NEPHELOMETRY, 42, AirQualityScale.US_EPA, None),
+        (Pollutant.PM25, 41, AirQualityScale.EUROPEAN, 1),
+        (Pollutant.PM25, 42, AirQualityScale.EUROPEAN, 2),
+        (Pollutant.PM25, 100, AirQualityScale.EUROPEAN, 4),
+        (Pollutant.PM25, 500, AirQualityScale.EUROPEAN, 6),
+        (Pollutant.OZONE, 23.3, AirQualityScale.EUROPEAN, 1),
+        (Pollutant.NITROGEN_DIOXIDE, 1, AirQualityScale.EUROPEAN, 1),
+        (Pollutant.CARBON_MONOXIDE, 42, AirQualityScale.EUROPEAN, None),
+    ],
+)
+def test_convert_index(
+    pollutant: Pollutant,
+    value: float,
+    scale: AirQualityScale,
+    expected: int | None,
+) -> None:
+    """Test converting sub-indices to other scales."""
+    assert convert_index(pollutant, value, scale) == expected
+
+
+def test_convert() -> None:
+    """Test converting the sub-indices of a reading."""
+    air_quality = load_air_quality("station_number_feed_10142.json")
+    converted = convert(air_quality.extended_air_quality, AirQualityScale.US_EPA)
+    assert converted == ConvertedAirQuality(
+        scale=AirQualityScale.US_EPA,
+        indices={
+            Pollutant.PM25: 3,
+            Pollutant.PM10: 11,
+            Pollutant.OZONE: 23,
+            Pollutant.NITROGEN_DIOXIDE: 1,
+            Pollutant.SULFUR_DIOXIDE: 1,
+            Pollutant.CARBON_MONOXIDE: 1,
+        },
+        air_quality_index=23,
+        dominant_pollutant=Pollutant.OZONE,
+    )
+
+
+def test_convert_without_pollutants() -> None:
+    """Test converting a reading without any covered pollutant."""
+    extended = WAQIExtendedAirQuality.from_dict({"neph": {"v": 2}, "t": {"v": 18}})
+    assert convert(extended, AirQualityScale.EUROPEAN) == ConvertedAirQuality(
+        scale=AirQualityScale.EUROPEAN,
+        indices={},
+        air_quality_index=None,
+        dominant_pollutant=None,
+    )
+
+
+@pytest.mark.parametrize("scale", list(AirQualityScale))
+def test_convert_batch(scale: AirQualityScale) -> None:
+    """Test converting a batch matches converting every reading."""
+    batch = [
+        load_air_quality(fixture).extended_air_quality
+        for fixture in (*FEED_FIXTURES, *FEED_FIXTURES)
+    ]
+    assert convert_batch(batch, scale) == [convert(item, scale) for item in batch]
+    assert convert_batch([], scale) == []
+
+
+def test_convert_forecast() -> None:
+    """Test converting the daily forecasts."""
+    air_quality = load_air_quality("here.json")
+    converted = convert_forecast(air_quality.forecast, AirQualityScale.US_EPA)
+    assert list(converted) == [Pollutant.OZONE, Pollutant.PM10, Pollutant.PM25]
+    assert converted[Pollutant.PM25][0] == DailyForecast(
+        day=date(2023, 8, 7), average=24, minimum=17, maximum=29
+    )
+    european = convert_forecast(air_quality.forecast, AirQualityScale.EUROPEAN)
+    assert [forecast.maximum for forecast in european[Pollutant.PM25]] == [
+        1,
+        1,
+        1,
+        4,
+        4,
+    ]
@@ -0,0 +1,156 @@
+"""Tests for the geo cache."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+from aresponses import Response, ResponsesMockServer
+import pytest
+
+from aiowaqi import GeoCache, WAQIClient, WAQIConnectionError
+
+from . import load_air_quality, load_fixture
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from aiohttp.web_request import BaseRequest
+
+WAQI_URL = "api.waqi.info"
+
+
+def test_nearby_coordinates_share_cell() -> None:
+    """Test nearby coordinates resolve to the same reading."""
+    geo_cache = GeoCache(resolution=0.01)
+    air_quality = load_air_quality("coordinates.json")
+    geo_cache.add(52.1051, 5.1245, air_quality)
+    assert geo_cache.cell(52.1051, 5.1245) == geo_cache.cell(52.1059, 5.1241)
+    assert geo_cache.get(52.1059, 5.1241) is air_quality
+    assert geo_cache.get(52.1151, 5.1245) is None
+    assert geo_cache.cell(-0.001, -0.001) == (-1, -1)
+
+
+def test_expired_reading_keeps_station() -> None:
+    """Test an expired reading keeps the station of its cell."""
+    geo_cache = GeoCache(ttl=0)
+    geo_cache.add(52.1051, 5.1245, load_air_quality("coordinates.json"))
+    assert geo_cache.get(52.1051, 5.1245) is None
+    assert geo_cache.get_station(52.1051, 5.1245) == 4584
+    assert geo_cache.get_reading(4584) is None
+
+
+def test_eviction() -> None:
+    """Test cells and readings are evicted least recently used first."""
+    geo_cache = GeoCache(max_cells=2)
+    utrecht = load_air_quality("city_feed_utrecht.json")
+    maarssen = load_air_quality("city_feed_maarssen.json")
+    here = load_air_quality("here.json")
+    geo_cache.add(1, 1, utrecht)
+    geo_cache.add(2, 2, maarssen)
+    assert geo_cache.get(1, 1) is utrecht
+    geo_cache.add(3, 3, here)
+    assert len(geo_cache) == 2
+    assert geo_cache.get(2, 2) is None
+    assert geo_cache.get_reading(maarssen.station_id) is None
+    assert geo_cache.get(1, 1) is utrecht
+    assert geo_cache.get(3, 3) is here
+
+
+async def test_client_geo_cache(
+    aresponses: ResponsesMockServer,
+    authenticated_client: WAQIClient,
+) -> None:
+    """Test the client reuses cells and refreshes them by station number."""
+    authenticated_client.geo_cache = GeoCache(ttl=0)
+    aresponses.add(
+        WAQI_URL,
+        "/feed/geo:52.105031;5.124464",
+        "GET",
+        aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=load_fixture("coordinates.json"),
+        ),
+    )
+    aresponses.add(
+        WAQI_URL,
+        "/feed/@4584",
+        "GET",
+        aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=load_fixture("coordinates.json"),
+        ),
+    )
+    response = await authenticated_client.get_by_coordinates(52.105031, 5.124464)
+    assert response.station_id == 4584
+    response = await authenticated_client.get_by_coordinates(52.1052, 5.1249)
+    assert response.station_id == 4584
+    authenticated_client.geo_cache.ttl = 60
+    assert await authenticated_client.get_by_coordinates(52.1053, 5.1241) is response
+    aresponses.assert_plan_strictly_followed()
+
+
+async def test_client_removed_station(
+    aresponses: ResponsesMockServer,
+    authenticated_client: WAQIClient,
+) -> None:
+    """Test a cell of a removed station is resolved by coordinates again."""
+    authenticated_client.geo_cache = GeoCache(ttl=0)
+    authenticated_client.geo_cache.add(52.1051, 5.1245, load_air_quality("here.json"))
+    aresponses.add(
+        WAQI_URL,
+        "/feed/@5771",
+        "GET",
+        aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=load_fixture("station_number_feed_unknown.json"),
+        ),
+    )
+    aresponses.add(
+        WAQI_URL,
+        "/feed/geo:52.1051;5.1245",
+        "GET",
+        aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=load_fixture("coordinates.json"),
+        ),
+    )
+    response = await authenticated_client.get_by_coordinates(52.1051, 5.1245)
+    assert response.station_id == 4584
+    assert authenticated_client.geo_cache.get_station(52.1051, 5.1245) == 4584
+    aresponses.assert_plan_strictly_followed()
+
+
+async def test_client_removed_station_deadline(
+    aresponses: ResponsesMockServer,
+    authenticated_client: WAQIClient,
+) -> None:
+    """Test both lookups of a removed station share the deadline."""
+    authenticated_client.geo_cache = GeoCache(ttl=0)
+    authenticated_client.geo_cache.add(52.1051, 5.1245, load_air_quality("here.json"))
+
+    def delayed(fixture: str) -> Callable[[BaseRequest], Awaitable[Response]]:
+        """Return a handler responding with a fixture after a delay."""
+
+        async def handler(_: BaseRequest) -> Response:
+            await asyncio.sleep(0.3)
+            return aresponses.Response(
+                status=200,
+                headers={"Content-Type": "application/json"},
+                text=load_fixture(fixture),
+            )
+
+        return handler
+
+    aresponses.add(
+        WAQI_URL, "/feed/@5771", "GET", delayed("station_number_feed_unknown.json")
+    )
+    aresponses.add(
+        WAQI_URL, "/feed/geo:52.1051;5.1245", "GET", delayed("coordinates.json")
+    )
+    with pytest.raises(WAQIConnectionError):
+        await authenticated_client.get_by_coordinates(52.1051, 5.1245, deadline=0.5)
@@ -0,0 +1,51 @@
+"""Tests for the import time footprint of the package."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+
+import aiowaqi
+from aiowaqi import waqi
+
+
+def _loaded_modules(code: str) -> set[str]:
+    """Return the modules loaded after running code in a fresh interpreter."""
+    result = subprocess.run(  # noqa: S603
+        [
+            sys.executable,
+            "-c",
+            f"import sys\n{code}\nprint('\\n'.join(sys.modules))",
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return set(result.stdout.split())
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "import aiowaqi",
+        "from aiowaqi import WAQIError",
+        "from aiowaqi import WAQIClient, WAQIAirQuality",
+    ],
+)
+def test_import_is_light(code: str) -> None:
+    """Test importing the package does not load heavy dependencies."""
+    modules = _loaded_modules(code)
+    assert not {"aiohttp", "yarl", "importlib.metadata"} & modules
+
+
+def test_lazy_attributes() -> None:
+    """Test public names are resolved on first access."""
+    assert aiowaqi.WAQIClient is waqi.WAQIClient
+    assert "WAQIClient" in dir(aiowaqi)
+    assert waqi.get_version() == waqi.VERSION
+    with pytest.raises(AttributeError):
+        _ = aiowaqi.Unknown
+    with pytest.raises(AttributeError):
+        _ = waqi.UNKNOWN
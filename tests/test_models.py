@@ -0,0 +1,142 @@
+"""Tests for the WAQI models."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from datetime import date
+import json
+
+import pytest
+
+from aiowaqi import (
+    DailyForecast,
+    DailyForecasts,
+    WAQIError,
+    WAQIExtendedAirQuality,
+    models,
+)
+from aiowaqi.models import IAQI_SLOTS, Pollutant, Weather
+
+from . import load_air_quality, load_fixture
+
+
+def test_extended_air_quality_all_keys() -> None:
+    """Test every iaqi key is captured in a single pass."""
+    iaqi = json.loads(load_fixture("city_feed_olivias.json"))["data"]["iaqi"]
+    extended = WAQIExtendedAirQuality.from_dict(iaqi)
+    assert extended.to_dict() == {key: value["v"] for key, value in iaqi.items()}
+    assert extended.dew_point == 18
+    assert extended.wind == 1.5
+    assert extended.wind_gust == 10.8
+    assert extended.uv_index is None
+    assert extended.carbon_monoxide is None
+    assert extended.unknown == {}
+
+
+def test_extended_air_quality_unknown_keys() -> None:
+    """Test unknown iaqi keys are preserved."""
+    extended = WAQIExtendedAirQuality.from_dict(
+        {"uvi": {"v": 3}, "r": {"v": 0.4}, "pm25": {"v": 12}, "wd": {}}
+    )
+    assert extended.get(Weather.UV_INDEX) == 3
+    assert extended.get(Pollutant.PM25) == 12
+    assert extended.get("r") == 0.4
+    assert extended.get("wd") is None
+    assert extended.unknown == {"r": 0.4}
+    assert extended.to_dict() == {"pm25": 12, "uvi": 3, "r": 0.4}
+
+
+def test_extended_air_quality_slots() -> None:
+    """Test the slot layout covers pollutants and weather conditions."""
+    assert len(IAQI_SLOTS) == len(Pollutant) + len(Weather)
+    assert len(IAQI_SLOTS) <= 16
+    extended = WAQIExtendedAirQuality.from_dict({})
+    assert extended.keys == ()
+    assert extended.to_dict() == {}
+
+
+def test_extended_air_quality_shared_keys() -> None:
+    """Test readings reporting the same keys share their layout."""
+    first, second = (
+        WAQIExtendedAirQuality.from_dict(
+            json.loads(load_fixture("city_feed_utrecht.json"))["data"]["iaqi"]
+        )
+        for _ in range(2)
+    )
+    assert first.keys is second.keys
+    assert len(first.values) == len(first.keys)
+    reordered = WAQIExtendedAirQuality.from_dict(
+        dict(
+            reversed(
+                json.loads(load_fixture("city_feed_utrecht.json"))["data"][
+                    "iaqi"
+                ].items()
+            )
+        )
+    )
+    assert reordered == first
+    assert first != first.to_dict()
+
+
+def test_air_quality_extended_views() -> None:
+    """Test the named attributes read from the slot vector."""
+    air_quality = load_air_quality("station_number_feed_10142.json")
+    extended = air_quality.extended_air_quality
+    assert extended.nephelometry == 2
+    assert extended.ozone == 23.3
+    assert extended.sulfur_dioxide == 1.5
+    assert extended.nitrogen_dioxide == 1
+    assert extended.pm10 == 11
+    assert extended.humidity == 48.3
+    assert extended.pressure == 1027
+    assert extended.temperature == 18.7
+
+
+def test_air_quality_forecast() -> None:
+    """Test parsing the daily forecasts."""
+    air_quality = load_air_quality("here.json")
+    assert list(air_quality.forecast) == ["o3", "pm10", "pm25", "uvi"]
+    assert isinstance(air_quality.forecast._daily["o3"][0], dict)
+    assert air_quality.forecast["o3"][0] == DailyForecast(
+        day=date(2023, 8, 7), average=29, minimum=26, maximum=33
+    )
+    assert air_quality.forecast["o3"] is air_quality.forecast["o3"]
+    assert isinstance(air_quality.forecast._daily["pm10"][0], dict)
+    assert len(air_quality.forecast["uvi"]) == 1
+    assert repr(air_quality.forecast).startswith("DailyForecasts({'o3': [")
+    without_forecast = load_air_quality("station_number_feed_372382.json")
+    assert without_forecast.forecast == {}
+
+
+def test_extended_air_quality_key_layout_limit(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test key layouts are not shared once the limit is reached."""
+    monkeypatch.setattr(models, "_MAX_KEY_LAYOUTS", 0)
+    first, second = (
+        WAQIExtendedAirQuality.from_dict({"unlimited": {"v": 1}}) for _ in range(2)
+    )
+    assert first.keys is not second.keys
+    assert first == second
+
+
+def test_extended_air_quality_as_dict() -> None:
+    """Test the dataclass fields are the keys and values, not named values."""
+    extended = WAQIExtendedAirQuality.from_dict(
+        {"pm25": {"v": 12}, "t": {"v": 18.5}, "unknown": {}}
+    )
+    assert asdict(extended) == {
+        "keys": ("pm25", "t", "unknown"),
+        "values": (12, 18.5, None),
+    }
+    assert extended.to_dict() == {"pm25": 12, "t": 18.5}
+    assert extended.get("unknown") is None
+    assert extended.get("co") is None
+
+
+def test_malformed_forecast() -> None:
+    """Test a forecast missing a value is not mistaken for a missing index."""
+    forecasts = DailyForecasts({"pm25": [{"day": "2023-08-07", "avg": 24, "max": 29}]})
+    assert list(forecasts) == ["pm25"]
+    with pytest.raises(WAQIError, match="Malformed pm25 forecast, missing 'min'"):
+        forecasts.get("pm25")
+    with pytest.raises(WAQIError):
+        forecasts["pm25"]
@@ -0,0 +1,194 @@
+"""Tests for the WAQI pipeline."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+from aresponses import ResponsesMockServer
+import pytest
+
+from aiowaqi import Pipeline, WAQIAirQuality, WAQIClient, WAQIError
+from aiowaqi.pipeline import poll_source
+
+from . import load_fixture
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+WAQI_URL = "api.waqi.info"
+
+
+def _add_station(aresponses: ResponsesMockServer, station_number: int) -> None:
+    """Add a station feed response."""
+    aresponses.add(
+        WAQI_URL,
+        f"/feed/@{station_number}",
+        "GET",
+        aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=load_fixture(f"station_number_feed_{station_number}.json"),
+        ),
+    )
+
+
+class RecordingSink:
+    """Sink recording the batches it receives."""
+
+    def __init__(self, *, fail: bool = False) -> None:
+        """Initialize the sink."""
+        self.batches: list[list[WAQIAirQuality]] = []
+        self.fail = fail
+
+    async def __call__(self, batch: list[WAQIAirQuality]) -> None:
+        """Record a batch."""
+        if self.fail:
+            msg = "Sink failed"
+            raise RuntimeError(msg)
+        self.batches.append(batch)
+
+
+async def test_run(
+    aresponses: ResponsesMockServer,
+    authenticated_client: WAQIClient,
+) -> None:
+    """Test running a source through the pipeline in batches."""
+    for station_number in (6337, 10142, 10002):
+        _add_station(aresponses, station_number)
+    sink = RecordingSink()
+    async with Pipeline(authenticated_client, sink, batch_size=2) as pipeline:
+        await pipeline.run([6337, 10142, 10002])
+    assert [len(batch) for batch in sink.batches] == [2, 1]
+    assert sorted(
+        air_quality.station_id for batch in sink.batches for air_quality in batch
+    ) == [6337, 10002, 10142]
+
+
+async def test_run_unexpected_response(
+    aresponses: ResponsesMockServer,
+    authenticated_client: WAQIClient,
+) -> None:
+    """Test a response failing to parse does not stop the workers."""
+    aresponses.add(
+        WAQI_URL,
+        "/feed/@6337",
+        "GET",
+        aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text='{"status": "error", "data": "Over quota"}',
+        ),
+    )
+    _add_station(aresponses, 10142)
+    sink = RecordingSink()
+    async with Pipeline(authenticated_client, sink, concurrency=1) as pipeline:
+        await asyncio.wait_for(pipeline.run([6337, 10142]), 5)
+    assert [
+        air_quality.station_id for batch in sink.batches for air_quality in batch
+    ] == [10142]
+
+
+async def test_run_async_source(
+    aresponses: ResponsesMockServer,
+    authenticated_client: WAQIClient,
+) -> None:
+    """Test running an async source with unknown stations."""
+    _add_station(aresponses, 6337)
+    aresponses.add(
+        WAQI_URL,
+        "/feed/unknown",
+        "GET",
+        aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=load_fixture("name_feed_unknown.json"),
+        ),
+    )
+
+    async def source() -> AsyncIterator[int | str]:
+        yield "unknown"
+        yield 6337
+
+    sink = RecordingSink()
+    await Pipeline(authenticated_client, sink, concurrency=1).run(source())
+    assert [[item.station_id for item in batch] for batch in sink.batches] == [[6337]]
+
+
+async def test_flush_interval(
+    aresponses: ResponsesMockServer,
+    authenticated_client: WAQIClient,
+) -> None:
+    """Test batches are flushed after the flush interval."""
+    _add_station(aresponses, 6337)
+    sink = RecordingSink()
+    pipeline = Pipeline(authenticated_client, sink, flush_interval=0.01)
+    pipeline.start(poll_source([6337], interval=60))
+    for _ in range(100):
+        if sink.batches:
+            break
+        await asyncio.sleep(0.01)
+    assert len(sink.batches) == 1
+    await pipeline.close()
+    assert len(sink.batches) == 1
+
+
+async def test_start_twice(authenticated_client: WAQIClient) -> None:
+    """Test starting a pipeline twice."""
+    pipeline = Pipeline(authenticated_client, RecordingSink())
+    pipeline.start([])
+    with pytest.raises(WAQIError):
+        pipeline.start([])
+    await pipeline.close()
+    await pipeline.close()
+
+
+async def test_failing_sink(
+    aresponses: ResponsesMockServer,
+    authenticated_client: WAQIClient,
+) -> None:
+    """Test a failing sink stops the pipeline."""
+    _add_station(aresponses, 6337)
+
+    async def source() -> AsyncIterator[int]:
+        yield 6337
+        await asyncio.Event().wait()
+
+    pipeline = Pipeline(authenticated_client, RecordingSink(fail=True), batch_size=1)
+    with pytest.raises(RuntimeError):
+        await pipeline.run(source())
+
+
+async def test_failing_sink_on_close(
+    aresponses: ResponsesMockServer,
+    authenticated_client: WAQIClient,
+) -> None:
+    """Test a sink failing while draining is raised on close."""
+    _add_station(aresponses, 6337)
+    produced = asyncio.Event()
+
+    async def source() -> AsyncIterator[int]:
+        yield 6337
+        produced.set()
+        await asyncio.Event().wait()
+
+    pipeline = Pipeline(authenticated_client, RecordingSink(fail=True))
+    pipeline.start(source())
+    await produced.wait()
+    await pipeline._identifiers.join()
+    with pytest.raises(RuntimeError):
+        await pipeline.close()
+
+
+async def test_failed_sink_before_close(
+    aresponses: ResponsesMockServer,
+    authenticated_client: WAQIClient,
+) -> None:
+    """Test a sink that failed in the background is raised on close."""
+    _add_station(aresponses, 6337)
+    pipeline = Pipeline(authenticated_client, RecordingSink(fail=True), batch_size=1)
+    pipeline.start(poll_source([6337], interval=60))
+    assert pipeline._sink_task is not None
+    await asyncio.wait([pipeline._sink_task])
+    with pytest.raises(RuntimeError):
+        await pipeline.close()
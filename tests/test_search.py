@@ -0,0 +1,178 @@
+"""Tests for the local search index."""
+
+from __future__ import annotations
+
+from aresponses import ResponsesMockServer
+import pytest
+
+from aiowaqi import Coordinates, SearchIndex, WAQIClient, WAQISearchResult
+from aiowaqi.binary import BinaryReader, BinaryWriter
+from aiowaqi.models import Station
+from aiowaqi.search import normalize_keyword
+
+from . import load_air_quality, load_fixture
+
+WAQI_URL = "api.waqi.info"
+
+
+def _result(station_id: int, name: str) -> WAQISearchResult:
+    """Return a search result for a station name."""
+    return WAQISearchResult(
+        air_quality_index=10,
+        station_id=station_id,
+        station=Station(
+            external_url=f"https://aqicn.org/{station_id}",
+            name=name,
+            coordinates=Coordinates(latitude=52.0, longitude=5.0),
+        ),
+    )
+
+
+@pytest.fixture(name="search_index")
+def index() -> SearchIndex:
+    """Return a search index with a few stations."""
+    search_index = SearchIndex()
+    search_index.add(
+        [
+            _result(1, "Griftpark, Utrecht"),
+            _result(2, "Kardinaal de Jongweg, Utrecht"),
+            _result(3, "Klundert, Brabant"),
+            _result(4, "Utrecht-Overvecht"),
+            _result(5, "Zürich, Schimmelstrasse"),
+        ]
+    )
+    return search_index
+
+
+@pytest.mark.parametrize(
+    ("keyword", "expected"),
+    [
+        ("Zürich  Schimmelstrasse!", "zurich schimmelstrasse"),
+        ("  UTRECHT ", "utrecht"),
+        ("", ""),
+    ],
+)
+def test_normalize_keyword(keyword: str, expected: str) -> None:
+    """Test normalizing keywords."""
+    assert normalize_keyword(keyword) == expected
+
+
+@pytest.mark.parametrize(
+    ("keyword", "expected"),
+    [
+        ("utrecht", [1, 2, 4]),
+        ("utr", [1, 2, 4]),
+        ("utrecht grift", [1]),
+        ("klu", [3]),
+        ("klundret", [3]),
+        ("zurich", [5]),
+        ("over", [4]),
+        ("amsterdam", []),
+        ("utrecht amsterdam", []),
+        ("", []),
+    ],
+)
+def test_search(search_index: SearchIndex, keyword: str, expected: list[int]) -> None:
+    """Test prefix and fuzzy searching the local index."""
+    assert [result.station_id for result in search_index.search(keyword)] == expected
+
+
+def test_search_ranking() -> None:
+    """Test exact token matches rank above prefix matches."""
+    search_index = SearchIndex()
+    search_index.add([_result(1, "Utrechtseweg"), _result(2, "Utrecht")])
+    assert [result.station_id for result in search_index.search("utrecht")] == [2, 1]
+
+
+def test_search_cached(search_index: SearchIndex) -> None:
+    """Test local results are cached until the index changes."""
+    results = search_index.search("utrecht")
+    assert "utrecht" in search_index._local
+    assert search_index.search(" Utrecht") == results
+    search_index.add([_result(6, "Utrecht, Kanaalweg")])
+    assert len(search_index.search("utrecht")) == 4
+
+
+def test_renamed_station(search_index: SearchIndex) -> None:
+    """Test re-adding a station replaces its tokens."""
+    search_index.add([_result(3, "Zevenbergen")])
+    assert len(search_index) == 5
+    assert search_index.search("klundert") == []
+    assert [result.station_id for result in search_index.search("zeven")] == [3]
+
+
+def test_cache_size() -> None:
+    """Test the caches are bounded."""
+    search_index = SearchIndex(cache_size=1)
+    search_index.add([_result(1, "Utrecht")], keyword="utrecht")
+    search_index.add([_result(2, "Klundert")], keyword="klundert")
+    assert search_index.lookup("utrecht") == [_result(1, "Utrecht")]
+    assert search_index.lookup("klundert") == [_result(2, "Klundert")]
+    search_index.search("klundert")
+    search_index.search("utrecht")
+    assert search_index.lookup("amsterdam") is None
+
+
+def test_expired_results() -> None:
+    """Test lookups miss on expired results, while searches still match them."""
+    search_index = SearchIndex(ttl=0)
+    search_index.add([_result(1, "Utrecht")], keyword="utrecht")
+    search_index.add([_result(2, "Klundert")])
+    assert search_index.lookup("utrecht") is None
+    assert "utrecht" not in search_index._remote
+    assert search_index.lookup("klundert") is None
+    assert search_index.search("klundert") == [_result(2, "Klundert")]
+
+
+def test_state_expired_results(search_index: SearchIndex) -> None:
+    """Test restoring keeps the time results were added and drops old keywords."""
+    search_index.add([_result(6, "Amsterdam")], keyword="amsterdam")
+    writer = BinaryWriter()
+    search_index.write_state(writer)
+    restored = SearchIndex()
+    restored.read_state(BinaryReader(writer.getvalue()))
+    assert restored.lookup("amsterdam") == [_result(6, "Amsterdam")]
+    assert restored.lookup("klundert") == [_result(3, "Klundert, Brabant")]
+    expired = SearchIndex(ttl=0)
+    expired.read_state(BinaryReader(writer.getvalue()))
+    assert not expired._remote
+    assert expired.lookup("klundert") is None
+    assert len(expired.search("utrecht")) == 3
+
+
+def test_add_air_quality() -> None:
+    """Test indexing stations from feed results."""
+    air_quality = load_air_quality("city_feed_utrecht.json")
+    search_index = SearchIndex()
+    search_index.add_air_quality([air_quality])
+    results = search_index.search("grift")
+    assert [result.station_id for result in results] == [6332]
+    assert results[0].station.coordinates == air_quality.city.coordinates
+
+
+async def test_client_search_index(
+    aresponses: ResponsesMockServer,
+    waqi_client: WAQIClient,
+) -> None:
+    """Test the client only calls the API on local misses."""
+    waqi_client.authenticate("test")
+    waqi_client.search_index = SearchIndex()
+    for keyword in ("klundert", "unknown"):
+        aresponses.add(
+            WAQI_URL,
+            f"/search/?keyword={keyword}&token=test",
+            "GET",
+            aresponses.Response(
+                status=200,
+                headers={"Content-Type": "application/json"},
+                text=load_fixture(f"search_{keyword}.json"),
+            ),
+            match_querystring=True,
+        )
+    results = await waqi_client.search("klundert")
+    assert [result.station_id for result in results] == [6337]
+    assert await waqi_client.search("Klundert") == results
+    assert [result.station_id for result in await waqi_client.search("klu")] == [6337]
+    assert await waqi_client.search("unknown") == []
+    assert await waqi_client.search("unknown") == []
+    aresponses.assert_plan_strictly_followed()
@@ -0,0 +1,212 @@
+"""Tests for the binary serialization of WAQI models."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from datetime import date, datetime
+import json
+import struct
+from typing import Any
+
+import pytest
+
+from aiowaqi import (
+    DailyForecast,
+    DailyForecasts,
+    WAQIAirQuality,
+    WAQIExtendedAirQuality,
+    WAQISearchResult,
+    WAQISerializationError,
+)
+from aiowaqi.binary import BinaryReader, BinarySerializable, BinaryWriter
+
+from . import load_air_quality, load_fixture
+
+FEED_FIXTURES = [
+    "city_feed_utrecht.json",
+    "city_feed_maarssen.json",
+    "city_feed_klundert.json",
+    "city_feed_olivias.json",
+    "city_feed_failing_klundert.json",
+    "coordinates.json",
+    "here.json",
+    "station_number_feed_6337.json",
+]
+
+
+def _load_search_results(fixture: str) -> list[WAQISearchResult]:
+    """Load a search fixture."""
+    return [
+        WAQISearchResult.from_dict(result)
+        for result in json.loads(load_fixture(fixture))["data"]
+    ]
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize dates and forecasts for the JSON comparison."""
+    if isinstance(value, DailyForecasts):
+        return dict(value)
+    if isinstance(value, DailyForecast):
+        return asdict(value)
+    assert isinstance(value, date)
+    return value.isoformat()
+
+
+@pytest.mark.parametrize("fixture", FEED_FIXTURES)
+def test_air_quality_round_trip(fixture: str) -> None:
+    """Test round-tripping air quality through bytes."""
+    air_quality = load_air_quality(fixture)
+    data = air_quality.to_bytes()
+    assert WAQIAirQuality.from_bytes(data) == air_quality
+    assert len(data) < len(json.dumps(asdict(air_quality), default=_json_default))
+
+
+def test_air_quality_batch_round_trip() -> None:
+    """Test round-tripping a batch of air quality through bytes."""
+    batch = [load_air_quality(fixture) for fixture in FEED_FIXTURES]
+    data = WAQIAirQuality.batch_to_bytes(batch)
+    assert WAQIAirQuality.batch_from_bytes(data) == batch
+    assert len(data) < len(
+        json.dumps([asdict(item) for item in batch], default=_json_default)
+    )
+
+
+def test_air_quality_without_optional_values() -> None:
+    """Test round-tripping air quality with all nullable fields unset."""
+    air_quality = load_air_quality("city_feed_failing_klundert.json")
+    air_quality.air_quality_index = None
+    air_quality.dominant_pollutant = None
+    air_quality.measured_at = None
+    air_quality.extended_air_quality = WAQIExtendedAirQuality.from_dict({})
+    assert WAQIAirQuality.from_bytes(air_quality.to_bytes()) == air_quality
+
+
+def test_naive_datetime_round_trip() -> None:
+    """Test round-tripping a naive measurement time."""
+    air_quality = load_air_quality("city_feed_utrecht.json")
+    air_quality.measured_at = datetime(2023, 8, 7, 17)  # noqa: DTZ001
+    result = WAQIAirQuality.from_bytes(air_quality.to_bytes())
+    assert result.measured_at == air_quality.measured_at
+    assert result.measured_at is not None
+    assert result.measured_at.tzinfo is None
+
+
+@pytest.mark.parametrize("fixture", ["search_klundert.json", "search_unknown.json"])
+def test_search_result_round_trip(fixture: str) -> None:
+    """Test round-tripping search results through bytes."""
+    results = _load_search_results(fixture)
+    data = WAQISearchResult.batch_to_bytes(results)
+    assert WAQISearchResult.batch_from_bytes(data) == results
+    for result in results:
+        assert WAQISearchResult.from_bytes(result.to_bytes()) == result
+
+
+def test_extended_air_quality_round_trip() -> None:
+    """Test round-tripping extended air quality through bytes."""
+    extended = load_air_quality("city_feed_utrecht.json").extended_air_quality
+    assert WAQIExtendedAirQuality.from_bytes(extended.to_bytes()) == extended
+
+
+def test_extended_air_quality_unknown_round_trip() -> None:
+    """Test round-tripping unknown iaqi keys through bytes."""
+    extended = WAQIExtendedAirQuality.from_dict(
+        {"uvi": {"v": 3}, "r": {"v": 0.4}, "co": {"v": 1.2}}
+    )
+    assert WAQIExtendedAirQuality.from_bytes(extended.to_bytes()) == extended
+
+
+def test_invalid_float_slots() -> None:
+    """Test reading a bitmap with slots beyond the layout."""
+    with pytest.raises(WAQISerializationError):
+        WAQIExtendedAirQuality.from_bytes(b"\x03\x00\x80\x00")
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"",
+        b"\x02",
+        b"\x03\x00",
+        b"\x03\x01\x00\x00\x00\x00\xff\x00",
+    ],
+)
+def test_invalid_data(data: bytes) -> None:
+    """Test deserializing invalid data."""
+    with pytest.raises(WAQISerializationError):
+        WAQIAirQuality.from_bytes(data)
+
+
+def test_invalid_batch() -> None:
+    """Test deserializing an invalid batch."""
+    with pytest.raises(WAQISerializationError):
+        WAQISearchResult.batch_from_bytes(b"\x03\x02\x00\x00\x00")
+
+
+def test_trailing_data() -> None:
+    """Test deserializing data with trailing bytes."""
+    data = load_air_quality("city_feed_utrecht.json").to_bytes()
+    with pytest.raises(WAQISerializationError):
+        WAQIAirQuality.from_bytes(data + b"\x00")
+
+
+def test_unknown_dominant_pollutant() -> None:
+    """Test deserializing an unknown dominant pollutant."""
+    air_quality = load_air_quality("city_feed_utrecht.json")
+    data = air_quality.to_bytes().replace(b"\x02\x00o3", b"\x02\x00xx")
+    with pytest.raises(WAQISerializationError):
+        WAQIAirQuality.from_bytes(data)
+
+
+def test_timestamp_out_of_range() -> None:
+    """Test deserializing a timestamp beyond the supported dates."""
+    air_quality = load_air_quality("city_feed_utrecht.json")
+    writer = BinaryWriter()
+    writer.write_datetime(air_quality.measured_at)
+    encoded = writer.getvalue()
+    corrupted = encoded[:1] + struct.pack("<q", 2**62) + encoded[9:]
+    data = air_quality.to_bytes()
+    assert encoded in data
+    with pytest.raises(WAQISerializationError):
+        WAQIAirQuality.from_bytes(data.replace(encoded, corrupted))
+    batch = WAQIAirQuality.batch_to_bytes([air_quality])
+    with pytest.raises(WAQISerializationError):
+        WAQIAirQuality.batch_from_bytes(batch.replace(encoded, corrupted))
+
+
+def test_string_limits() -> None:
+    """Test string edge cases of the binary layout."""
+    writer = BinaryWriter()
+    with pytest.raises(WAQISerializationError):
+        writer.write_string("a" * 0xFFFF)
+    writer.write_string(None)
+    writer.write_uint16(10)
+    reader = BinaryReader(writer.getvalue())
+    with pytest.raises(WAQISerializationError):
+        reader.read_required_string()
+    with pytest.raises(WAQISerializationError):
+        reader.read_string()
+
+
+def test_unknown_datetime_marker() -> None:
+    """Test reading an unknown datetime marker."""
+    with pytest.raises(WAQISerializationError):
+        BinaryReader(b"\x03").read_datetime()
+
+
+def test_count_out_of_range() -> None:
+    """Test serializing more entries than the layout can count."""
+    extended = WAQIExtendedAirQuality.from_dict(
+        {f"unknown{index}": {"v": index} for index in range(256)}
+    )
+    with pytest.raises(WAQISerializationError):
+        extended.to_bytes()
+
+
+def test_abstract_model() -> None:
+    """Test a model has to implement reading and writing."""
+
+    class Incomplete(BinarySerializable):
+        """Model without serialization."""
+
+    with pytest.raises(TypeError):
+        Incomplete()  # type: ignore[abstract]
@@ -0,0 +1,183 @@
+"""Tests for saving and loading the state of the client."""
+
+from __future__ import annotations
+
+import json
+import struct
+from typing import TYPE_CHECKING
+
+import pytest
+
+from aiowaqi import (
+    CircuitBreaker,
+    CircuitState,
+    GeoCache,
+    SearchIndex,
+    WAQIClient,
+    WAQISearchResult,
+    WAQISerializationError,
+)
+from aiowaqi.binary import BinaryWriter
+
+from . import load_air_quality, load_fixture
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _warm_client() -> WAQIClient:
+    """Return a client with state in all of its features."""
+    geo_cache = GeoCache()
+    search_index = SearchIndex()
+    client = WAQIClient(
+        geo_cache=geo_cache,
+        search_index=search_index,
+        circuit_breaker_factory=lambda: CircuitBreaker(minimum_calls=1),
+    )
+    client._latencies.extend([0.1, 0.2, 0.3])
+    client._set_stale(
+        "feed/utrecht/", json.loads(load_fixture("city_feed_utrecht.json"))
+    )
+    breaker = CircuitBreaker(minimum_calls=1)
+    breaker.record_failure()
+    client._circuit_breakers["feed/"] = breaker
+    client._circuit_breakers["search/"] = CircuitBreaker(minimum_calls=1)
+    geo_cache.add(52.105031, 5.124464, load_air_quality("coordinates.json"))
+    search_index.add(
+        [
+            WAQISearchResult.from_dict(result)
+            for result in json.loads(load_fixture("search_klundert.json"))["data"]
+        ],
+        keyword="klundert",
+    )
+    return client
+
+
+def test_state_round_trip(tmp_path: Path) -> None:
+    """Test a restored client resumes with the saved state."""
+    path = tmp_path / "state.bin"
+    client = _warm_client()
+    client.save_state(path)
+    assert not (tmp_path / "state.bin.tmp").exists()
+
+    restored = WAQIClient(
+        geo_cache=GeoCache(),
+        search_index=SearchIndex(),
+        circuit_breaker_factory=lambda: CircuitBreaker(minimum_calls=1),
+    )
+    restored.load_state(path)
+    assert restored._latencies == client._latencies
+    assert restored._get_stale("feed/utrecht/") == client._get_stale("feed/utrecht/")
+    assert {
+        route: breaker.state for route, breaker in restored.circuit_breakers.items()
+    } == {"feed/": CircuitState.OPEN, "search/": CircuitState.CLOSED}
+    assert restored.circuit_breakers["feed/"].failure_rate == 1
+    assert not restored.circuit_breakers["feed/"].allow_request()
+    assert restored.geo_cache is not None
+    assert restored.geo_cache.get(52.1051, 5.1245) == load_air_quality(
+        "coordinates.json"
+    )
+    assert restored.search_index is not None
+    lookup = restored.search_index.lookup("klundert")
+    assert lookup is not None
+    assert [result.station_id for result in lookup] == [6337]
+    assert [result.station_id for result in restored.search_index.search("klu")] == [
+        6337
+    ]
+
+
+def test_state_without_features(tmp_path: Path) -> None:
+    """Test state of features that are not enabled is skipped."""
+    path = tmp_path / "state.bin"
+    _warm_client().save_state(path)
+    client = WAQIClient()
+    client.load_state(path)
+    assert len(client._latencies) == 3
+    assert client.circuit_breakers == {}
+    assert client.geo_cache is None
+    assert client.search_index is None
+
+    WAQIClient().save_state(path)
+    client = _warm_client()
+    client.load_state(path)
+    assert not client._latencies
+    assert not client._stale
+    assert client.circuit_breakers == {}
+    assert client.geo_cache is not None
+    assert len(client.geo_cache) == 1
+
+
+def test_state_replaces_latencies(tmp_path: Path) -> None:
+    """Test loading the state replaces the latencies instead of adding to them."""
+    path = tmp_path / "state.bin"
+    client = _warm_client()
+    client.save_state(path)
+    client.load_state(path)
+    assert list(client._latencies) == [0.1, 0.2, 0.3]
+
+
+def test_invalid_state_leaves_client_untouched(tmp_path: Path) -> None:
+    """Test a truncated state file does not restore part of the state."""
+    path = tmp_path / "state.bin"
+    _warm_client().save_state(path)
+    path.write_bytes(path.read_bytes()[:-1])
+    geo_cache = GeoCache()
+    client = WAQIClient(geo_cache=geo_cache, search_index=SearchIndex())
+    with pytest.raises(WAQISerializationError):
+        client.load_state(path)
+    assert not client._latencies
+    assert not client._stale
+    assert client.geo_cache is geo_cache
+    assert len(geo_cache) == 0
+
+
+def test_state_drops_outdated_entries(tmp_path: Path) -> None:
+    """Test expired readings, cells of another resolution and excess are dropped."""
+    path = tmp_path / "state.bin"
+    _warm_client().save_state(path)
+    client = WAQIClient(geo_cache=GeoCache(resolution=0.1, ttl=0), stale_max_age=0)
+    client.load_state(path)
+    assert not client._stale
+    assert client.geo_cache is not None
+    assert len(client.geo_cache) == 0
+    assert client.geo_cache.get_reading(4584) is None
+
+    client = WAQIClient(geo_cache=GeoCache(max_cells=0), stale_cache_size=0)
+    client.load_state(path)
+    assert not client._stale
+    assert client.geo_cache is not None
+    assert len(client.geo_cache) == 0
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"",
+        b"\x02",
+        b"\x03\x00\x00\x01\x00\x00\x00\x01\x00a" + bytes(8) + b"\x05\x00\x00\x00",
+        b"\x03\x00\x00\x00\x00\x00\x00\x01\x00\x01\x00a\x05\x00close",
+        b"\x03\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    ],
+)
+def test_invalid_state(tmp_path: Path, data: bytes) -> None:
+    """Test loading an invalid state file."""
+    path = tmp_path / "state.bin"
+    path.write_bytes(data)
+    with pytest.raises(WAQISerializationError):
+        WAQIClient().load_state(path)
+
+
+def test_state_timestamp_out_of_range(tmp_path: Path) -> None:
+    """Test a corrupt timestamp of a cached reading is a serialization error."""
+    path = tmp_path / "state.bin"
+    _warm_client().save_state(path)
+    writer = BinaryWriter()
+    writer.write_datetime(load_air_quality("coordinates.json").measured_at)
+    encoded = writer.getvalue()
+    data = path.read_bytes()
+    assert encoded in data
+    path.write_bytes(
+        data.replace(encoded, encoded[:1] + struct.pack("<q", 2**62) + encoded[9:])
+    )
+    with pytest.raises(WAQISerializationError):
+        WAQIClient(geo_cache=GeoCache()).load_state(path)
@@ -0,0 +1,33 @@
+"""Tests for the WAQI utilities."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from aiowaqi.util import to_nullable_int
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (29, 29),
+        (29.7, 29),
+        ("29", 29),
+        (" -3 ", -3),
+        ("+4", 4),
+        ("-", None),
+        ("", None),
+        ("2.5", None),
+        ("-+3", None),
+        ("--3", None),
+        (float("nan"), None),
+        (float("inf"), None),
+        (float("-inf"), None),
+        (None, None),
+    ],
+)
+def test_to_nullable_int(value: Any, expected: int | None) -> None:
+    """Test converting AQI values without raising."""
+    assert to_nullable_int(value) == expected
@@ -23,6 +23,8 @@ from aiowaqi import (
 from . import load_fixture
 
 if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
     from syrupy import SnapshotAssertion
 
 WAQI_URL = "api.waqi.info"
@@ -381,3 +383,335 @@ async def test_get_by_ip(
     )
     response = await authenticated_client.get_by_ip()
     assert response == snapshot
+
+
+def _json_response(
+    aresponses: ResponsesMockServer,
+    fixture: str,
+    delay: float = 0,
+) -> Callable[[BaseRequest], Awaitable[Response]]:
+    """Return a response handler answering with a fixture after a delay."""
+
+    async def response_handler(_: BaseRequest) -> Response:
+        """Response handler for this test."""
+        await asyncio.sleep(delay)
+        return aresponses.Response(
+            status=200,
+            headers={"Content-Type": "application/json"},
+            text=load_fixture(fixture),
+        )
+
+    return response_handler
+
+
+async def test_deadline(
+    aresponses: ResponsesMockServer,
+    authenticated_client: WAQIClient,
+) -> None:
+    """Test a per-call deadline overrides the request timeout."""
+    aresponses.add(
+        WAQI_URL,
+        "/feed/utrecht",
+        "GET",
+        _json_response(aresponses, "city_feed_utrecht.json", delay=1),
+    )
+    with pytest.raises(WAQIConnectionError):
+        await authenticated_client.get_by_city("utrecht", deadline=0.05)
+
+
+async def test_hedged_request(
+    aresponses: ResponsesMockServer,
+    authenticated_client: WAQIClient,
+) -> None:
+    """Test a slow request is hedged with a duplicate."""
+    authenticated_client.hedge_requests = True
+    authenticated_client._latencies.extend([0.01] * 20)
+    aresponses.add(
+        WAQI_URL,
+        "/feed/utrecht",
+        "GET",
+        _json_response(aresponses, "city_feed_utrecht.json", delay=5),
+    )
+    aresponses.add(
+        WAQI_URL,
+        "/feed/utrecht",
+        "GET",
+        _json_response(aresponses, "city_feed_utrecht.json"),
+    )
+    response = await authenticated_client.get_by_city("utrecht", deadline=1)
+    assert response.station_id == 6332
+
+
+async def test_hedged_request_fast(
+    aresponses: ResponsesMockServer,
+    authenticated_client: WAQIClient,
+) -> None:
+    """Test a request answered within the hedge delay is not duplicated."""
+    authenticated_client.hedge_requests = True
+    assert authenticated_client._hedge_delay() is None
+    authenticated_client._latencies.extend([1.0] * 20)
+    aresponses.add(
+        WAQI_URL,
+        "/feed/utrecht",
+        "GET",
+        _json_response(aresponses, "city_feed_utrecht.json"),
+    )
+    response = await authenticated_client.get_by_city("utrecht")
+    assert response.station_id == 6332
+    aresponses.assert_plan_strictly_followed()
+
+
+async def test_hedged_request_primary_fails(
+    aresponses: ResponsesMockServer,
+    authenticated_client: WAQIClient,
+) -> None:
+    """Test the hedge is used when the original request fails."""
+    authenticated_client.hedge_requests = True
+    authenticated_client._latencies.extend([0.01] * 20)
+
+    async def failing_handler(_: BaseRequest) -> Response:
+        """Response handler for this test."""
+        await asyncio.sleep(0.1)
+        return aresponses.Response(text="Yes", headers={"Content-Type": "text/plain"})
+
+    aresponses.add(WAQI_URL, "/feed/utrecht", "GET", failing_handler)
+    aresponses.add(
+        WAQI_URL,
+        "/feed/utrecht",
+        "GET",
+        _json_response(aresponses, "city_feed_utrecht.json", delay=0.3),
+    )
+    response = await authenticated_client.get_by_city("utrecht")
+    assert response.station_id == 6332
+
+
+async def test_hedged_request_both_fail(
+    aresponses: ResponsesMockServer,
+    authenticated_client: WAQIClient,
+) -> None:
+    """Test an error is raised when both the request and its hedge fail."""
+    authenticated_client.hedge_requests = True
+    authenticated_client._latencies.extend([0.01] * 20)
+
+    async def failing_handler(_: BaseRequest) -> Response:
+        """Response handler for this test."""
+        await asyncio.sleep(0.1)
+        return aresponses.Response(text="Yes", headers={"Content-Type": "text/plain"})
+
+    aresponses.add(WAQI_URL, "/feed/utrecht", "GET", failing_handler)
+    aresponses.add(WAQI_URL, "/feed/utrecht", "GET", failing_handler)
+    with pytest.raises(WAQIError):
+        await authenticated_client.get_by_city("utrecht")
+
+
+async def test_stale_while_revalidate(
+    aresponses: ResponsesMockServer,
+    authenticated_client: WAQIClient,
+) -> None:
+    """Test cached readings are returned while refreshing in the background."""
+    authenticated_client.stale_while_revalidate = True
+    aresponses.add(
+        WAQI_URL,
+        "/feed/utrecht",
+        "GET",
+        _json_response(aresponses, "city_feed_utrecht.json"),
+    )
+    aresponses.add(
+        WAQI_URL,
+        "/feed/utrecht",
+        "GET",
+        _json_response(aresponses, "coordinates.json"),
+    )
+    aresponses.add(
+        WAQI_URL,
+        "/feed/utrecht",
+        "GET",
+        aresponses.Response(text="Yes", headers={"Content-Type": "text/plain"}),
+    )
+    assert (await authenticated_client.get_by_city("utrecht")).station_id == 6332
+    assert (await authenticated_client.get_by_city("utrecht")).station_id == 6332
+    assert (await authenticated_client.get_by_city("utrecht")).station_id == 6332
+    await asyncio.gather(*authenticated_client._revalidating.values())
+    assert (await authenticated_client.get_by_city("utrecht")).station_id == 4584
+    await asyncio.gather(*authenticated_client._revalidating.values())
+    assert (await authenticated_client.get_by_city("utrecht")).station_id == 4584
+    await authenticated_client.close()
+    assert not authenticated_client._revalidating
+
+
+async def test_stale_cache_size(
+    aresponses: ResponsesMockServer,
+    authenticated_client: WAQIClient,
+) -> None:
+    """Test the least recently used responses are evicted."""
+    authenticated_client.stale_while_revalidate = True
+    authenticated_client.stale_cache_size = 1
+    for city in ("utrecht", "maarssen"):
+        aresponses.add(
+            WAQI_URL,
+            f"/feed/{city}",
+            "GET",
+            _json_response(aresponses, "city_feed_utrecht.json"),
+        )
+        await authenticated_client.get_by_city(city)
+    (key,) = authenticated_client._stale
+    assert key.endswith("/feed/maarssen")
+
+
+async def test_stale_max_age(
+    aresponses: ResponsesMockServer,
+    authenticated_client: WAQIClient,
+) -> None:
+    """Test responses older than the maximum age are not served."""
+    authenticated_client.stale_while_revalidate = True
+    authenticated_client.stale_max_age = 0
+    aresponses.add(
+        WAQI_URL,
+        "/feed/utrecht",
+        "GET",
+        _json_response(aresponses, "city_feed_utrecht.json"),
+    )
+    aresponses.add(
+        WAQI_URL,
+        "/feed/utrecht",
+        "GET",
+        _json_response(aresponses, "coordinates.json"),
+    )
+    assert (await authenticated_client.get_by_city("utrecht")).station_id == 6332
+    assert (await authenticated_client.get_by_city("utrecht")).station_id == 4584
+    assert not authenticated_client._revalidating
+    aresponses.assert_plan_strictly_followed()
+
+
+async def test_skip_sections(
+    aresponses: ResponsesMockServer,
+    authenticated_client: WAQIClient,
+) -> None:
+    """Test skipped sections are dropped before parsing and caching."""
+    authenticated_client.skip_sections = frozenset({"forecast", "debug"})
+    authenticated_client.stale_while_revalidate = True
+    aresponses.add(
+        WAQI_URL,
+        "/feed/@6332",
+        "GET",
+        _json_response(aresponses, "city_feed_utrecht.json"),
+    )
+    aresponses.add(
+        WAQI_URL,
+        "/feed/unknown",
+        "GET",
+        _json_response(aresponses, "city_feed_unknown.json"),
+    )
+    air_quality = await authenticated_client.get_by_station_number(6332)
+    assert air_quality.forecast == {}
+    assert air_quality.extended_air_quality.pm25 == 1
+    ((_, cached),) = authenticated_client._stale.values()
+    assert "forecast" not in cached["data"]
+    assert "debug" not in cached["data"]
+    with pytest.raises(WAQIError):
+        await authenticated_client.get_by_city("unknown")
+    await authenticated_client.close()
+
+
+def test_skip_required_sections() -> None:
+    """Test only optional sections can be skipped."""
+    with pytest.raises(WAQIError, match="Cannot skip sections city, iaqi"):
+        WAQIClient(skip_sections=frozenset({"forecast", "iaqi", "city"}))
+    with pytest.raises(WAQIError, match="Cannot skip sections iaqi"):
+        WAQIClient(skip_sections=["iaqi"])  # type: ignore[arg-type]
+    client = WAQIClient(skip_sections=("forecast", "debug"))  # type: ignore[arg-type]
+    assert client.skip_sections == frozenset({"forecast", "debug"})
+
+
+async def test_stale_while_revalidate_skips_errors(
+    aresponses: ResponsesMockServer,
+    authenticated_client: WAQIClient,
+) -> None:
+    """Test error responses are not cached."""
+    authenticated_client.stale_while_revalidate = True
+    for _ in range(2):
+        aresponses.add(
+            WAQI_URL,
+            "/feed/unknown",
+            "GET",
+            _json_response(aresponses, "city_feed_unknown.json"),
+        )
+        with pytest.raises(WAQIError):
+            await authenticated_client.get_by_city("unknown")
+    assert not authenticated_client._stale
+
+
+async def test_stale_while_revalidate_refresh_error(
+    aresponses: ResponsesMockServer,
+    authenticated_client: WAQIClient,
+) -> None:
+    """Test error responses do not replace the cached reading."""
+    authenticated_client.stale_while_revalidate = True
+    aresponses.add(
+        WAQI_URL,
+        "/feed/utrecht",
+        "GET",
+        _json_response(aresponses, "city_feed_utrecht.json"),
+    )
+    aresponses.add(
+        WAQI_URL,
+        "/feed/utrecht",
+        "GET",
+        _json_response(aresponses, "city_feed_unknown.json"),
+    )
+    await authenticated_client.get_by_city("utrecht")
+    await authenticated_client.get_by_city("utrecht")
+    await asyncio.gather(*authenticated_client._revalidating.values())
+    assert (await authenticated_client.get_by_city("utrecht")).station_id == 6332
+
+
+async def test_stale_while_revalidate_unexpected_error(
+    aresponses: ResponsesMockServer,
+    authenticated_client: WAQIClient,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test unexpected errors while refreshing are logged."""
+    authenticated_client.stale_while_revalidate = True
+    aresponses.add(
+        WAQI_URL,
+        "/feed/utrecht",
+        "GET",
+        _json_response(aresponses, "city_feed_utrecht.json"),
+    )
+    aresponses.add(
+        WAQI_URL,
+        "/feed/utrecht",
+        "GET",
+        aresponses.Response(text="{}", headers={"Content-Type": "application/json"}),
+    )
+    await authenticated_client.get_by_city("utrecht")
+    await authenticated_client.get_by_city("utrecht")
+    await asyncio.gather(*authenticated_client._revalidating.values())
+    assert "Unexpected error refreshing" in caplog.text
+    assert (await authenticated_client.get_by_city("utrecht")).station_id == 6332
+    await authenticated_client.close()
+
+
+async def test_close_cancels_revalidation(
+    aresponses: ResponsesMockServer,
+    authenticated_client: WAQIClient,
+) -> None:
+    """Test closing the client cancels background refreshes."""
+    authenticated_client.stale_while_revalidate = True
+    aresponses.add(
+        WAQI_URL,
+        "/feed/utrecht",
+        "GET",
+        _json_response(aresponses, "city_feed_utrecht.json"),
+    )
+    aresponses.add(
+        WAQI_URL,
+        "/feed/utrecht",
+        "GET",
+        _json_response(aresponses, "city_feed_utrecht.json", delay=5),
+    )
+    await authenticated_client.get_by_city("utrecht")
+    await authenticated_client.get_by_city("utrecht")
+    tasks = list(authenticated_client._revalidating.values())
+    await authenticated_client.close()
+    assert all(task.cancelled() for task in tasks)